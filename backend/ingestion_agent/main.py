@@ -1,6 +1,7 @@
 from fastapi import FastAPI, UploadFile, File, Request
 from google.cloud import storage
 import uuid, os
+from functools import lru_cache
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from invention_detection_classification_agent.vertex_query import run_idca
@@ -14,10 +15,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize GCS client
+# GCS client/bucket are created on first upload (not at import) and reused afterwards
 bucket_name = os.environ.get("BUCKET_NAME")
-storage_client = storage.Client()
-bucket = storage_client.bucket(bucket_name)
+
+@lru_cache(maxsize=1)
+def get_bucket() -> storage.Bucket:
+    return storage.Client().bucket(bucket_name)
 
 
 @app.get("/")
@@ -28,7 +31,7 @@ def health():
 async def ingest(file: UploadFile = File(...)):
     try:
         blob_name = f"{uuid.uuid4()}-{file.filename}"
-        blob = bucket.blob(blob_name)
+        blob = get_bucket().blob(blob_name)
         blob.upload_from_file(file.file, rewind=True)
         gcs_uri = f"gs://{bucket_name}/{blob_name}"
 
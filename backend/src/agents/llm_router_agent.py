@@ -9,7 +9,10 @@ from ..llm.vertex import get_vertex_chat_model
 from ..prompts.llm_router_prompt import LLM_ROUTER_PROMPT
 
 # Allowed route values
-_VALID = {"PASS", "REFINE", "REFINE_DATE"}
+_VALID = frozenset({"PASS", "REFINE", "REFINE_DATE"})
+
+# str.translate table deleting both quote characters in one pass
+_DROP_QUOTES = str.maketrans("", "", "\"'")
 
 log = get_logger(__name__)
 
@@ -32,7 +35,9 @@ def _normalize_route(s: str) -> str:
     - Converts to uppercase.
     - Falls back to "REFINE" if the result is not in _VALID.
     """
-    r = s.strip().upper().replace('"', "").replace("'", "")
+    if s in _VALID:  # well-behaved model output: nothing to clean
+        return s
+    r = s.translate(_DROP_QUOTES).strip().upper()
     return r if r in _VALID else "REFINE"
 
 class LLMRouterAgent:
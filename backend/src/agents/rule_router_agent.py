@@ -1,13 +1,61 @@
 from __future__ import annotations
-from typing import Mapping, Dict, Any, List, Optional
+from typing import Mapping, Dict, Any, List, Optional, Tuple
 import json
 import re
 
 from ..config import get_logger
 from ..core.instrumentation import log_invoke_start, log_invoke_end
 
+# Optional regex engines, used only when a router opts in via `regex_engine`
+try:
+    import re2 as _re2  # linear-time, no backtracking (pip install google-re2)
+except ImportError:  # pragma: no cover
+    _re2 = None
+try:
+    import regex as _regex  # drop-in superset of `re` (pip install regex)
+except ImportError:  # pragma: no cover
+    _regex = None
+
+_REGEX_ENGINES = {"re": re, "re2": _re2, "regex": _regex}
+
 log = get_logger(__name__)
 
+
+def _compile_keyword_scan(keywords: Tuple[str, ...]):
+    """
+    Build one regex that finds every (lowercased) keyword in a single pass.
+    A zero-width lookahead reports a match at each position, so overlapping
+    keywords are all seen; this only breaks down when one keyword is a prefix
+    of another (both could start at one position), so return None in that case
+    (and for fewer than two keywords) and let callers use plain substring checks.
+    """
+    if len(keywords) < 2:
+        return None
+    if any(a != b and b.startswith(a) for a in keywords for b in keywords):
+        return None
+    alternation = "|".join(re.escape(k) for k in keywords)
+    return re.compile(f"(?=({alternation}))")
+
+
+def _compile_regex(pattern: str, engine: str = "re"):
+    """
+    Compile `pattern` with the requested engine ("re" | "re2" | "regex").
+    The default is the stdlib `re`, so verdicts never depend on which optional
+    packages happen to be installed. Opting into an engine that is missing raises
+    ValueError; patterns RE2 rejects (backreferences, lookarounds) use `re`.
+    """
+    if engine not in _REGEX_ENGINES:
+        raise ValueError(f"Unknown regex_engine: {engine!r} (expected one of {sorted(_REGEX_ENGINES)})")
+    mod = _REGEX_ENGINES[engine]
+    if mod is None:
+        raise ValueError(f"regex_engine={engine!r} requested but the module is not installed")
+    if mod is _re2:
+        try:
+            return mod.compile(pattern)
+        except Exception:
+            return re.compile(pattern)
+    return mod.compile(pattern)
+
 class RuleRouterAgent:
     """
     A deterministic, rule-based router that evaluates text against predefined
@@ -26,8 +74,16 @@ class RuleRouterAgent:
         - forbid: Fail if any forbidden substrings are present.
         - require_json: Fail if the text is not valid JSON.
         - regex: Fail if it does not match the given regex pattern.
+                 Compiled with stdlib `re` unless `regex_engine` is "re2" or
+                 "regex". RE2 matches differently even for patterns it accepts:
+                 `$` does not match before a trailing newline, and `\\b` / `\\w`
+                 are ASCII-only, so opt in only for patterns that avoid these.
     """
 
+    # Slotted: fixed attribute set, no per-instance __dict__ (instances are cached by the generic route)
+    __slots__ = ("min_len", "max_len", "must_include", "forbid", "_must_include_l", "_forbid_l",
+                 "_kw_scan", "require_json", "regex", "regex_engine", "pass_route", "fail_route")
+
     def __init__(
         self,
         *,
@@ -37,6 +93,7 @@ class RuleRouterAgent:
         forbid: Optional[List[str]] = None,
         require_json: bool = False,
         regex: Optional[str] = None,
+        regex_engine: str = "re",
         pass_route: str = "PASS",
         fail_route: str = "REFINE",
     ):
@@ -45,8 +102,14 @@ class RuleRouterAgent:
         self.max_len = max_len
         self.must_include = must_include or []
         self.forbid = forbid or []
+        # Lowercased keyword tuples, computed once for case-insensitive scans
+        self._must_include_l = tuple(k.lower() for k in self.must_include)
+        self._forbid_l = tuple(k.lower() for k in self.forbid)
+        # Single-pass scanner over all keywords (None → per-keyword `in` checks)
+        self._kw_scan = _compile_keyword_scan(tuple(dict.fromkeys(self._must_include_l + self._forbid_l)))
         self.require_json = require_json
-        self.regex = re.compile(regex) if regex else None
+        self.regex_engine = regex_engine
+        self.regex = _compile_regex(regex, regex_engine) if regex else None
 
         # Routing labels
         self.pass_route = pass_route
@@ -69,37 +132,49 @@ class RuleRouterAgent:
         t0 = log_invoke_start(log, "RuleRouterAgent", state)
 
         text = str(state.get("draft", ""))
+        n = len(text)
         reasons: List[str] = []
         route = self.pass_route  # Default to pass
 
         # 1. Minimum length check
-        if self.min_len is not None and len(text) < self.min_len:
+        if self.min_len is not None and n < self.min_len:
             route, reasons = self.fail_route, [f"min_len<{self.min_len}"]
 
         # 2. Maximum length check
-        elif self.max_len is not None and len(text) > self.max_len:
+        elif self.max_len is not None and n > self.max_len:
             route, reasons = self.fail_route, [f"max_len>{self.max_len}"]
 
-        # 3. Must-include keywords check
-        elif self.must_include and not all(k.lower() in text.lower() for k in self.must_include):
-            missing = [k for k in self.must_include if k.lower() not in text.lower()]
-            route, reasons = self.fail_route, [f"missing:{','.join(missing)}"]
-
-        # 4. Forbidden keywords check
-        elif self.forbid and any(k.lower() in text.lower() for k in self.forbid):
-            bad = [k for k in self.forbid if k.lower() in text.lower()]
-            route, reasons = self.fail_route, [f"forbidden:{','.join(bad)}"]
-
-        # 5. JSON validity check
-        elif self.require_json:
-            try:
-                json.loads(text)
-            except Exception as e:
-                route, reasons = self.fail_route, [f"json_error:{type(e).__name__}"]
-
-        # 6. Regex match check
-        elif self.regex and not self.regex.search(text):
-            route, reasons = self.fail_route, ["regex:no-match"]
+        # Length checks passed → run the remaining checks
+        else:
+            # Lowercase once for the keyword checks (only when needed)
+            tl = text.lower() if (self._must_include_l or self._forbid_l) else text
+            if self._kw_scan is not None:
+                # One O(N) pass collects every keyword present in the text
+                found = {m.group(1) for m in self._kw_scan.finditer(tl)}
+                missing = [k for k, kl in zip(self.must_include, self._must_include_l) if kl not in found]
+                bad = [] if missing else [k for k, kl in zip(self.forbid, self._forbid_l) if kl in found]
+            else:
+                missing = [k for k, kl in zip(self.must_include, self._must_include_l) if kl not in tl]
+                bad = [] if missing else [k for k, kl in zip(self.forbid, self._forbid_l) if kl in tl]
+
+            # 3. Must-include keywords check
+            if missing:
+                route, reasons = self.fail_route, [f"missing:{','.join(missing)}"]
+
+            # 4. Forbidden keywords check
+            elif bad:
+                route, reasons = self.fail_route, [f"forbidden:{','.join(bad)}"]
+
+            # 5. JSON validity check
+            elif self.require_json:
+                try:
+                    json.loads(text)
+                except Exception as e:
+                    route, reasons = self.fail_route, [f"json_error:{type(e).__name__}"]
+
+            # 6. Regex match check
+            elif self.regex and not self.regex.search(text):
+                route, reasons = self.fail_route, ["regex:no-match"]
 
         # Build output with route and reasons
         out = {"route": route, "reasons": reasons}
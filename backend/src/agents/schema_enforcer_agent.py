@@ -20,8 +20,8 @@ class SchemaEnforcerAgent:
 
       - mode="json":
           Attempts to parse the chosen field as JSON (via json.loads).
-          If a Pydantic schema is provided, validates the parsed object
-          and coerces it into a Python dict.  
+          If a Pydantic schema is provided, parses and validates the raw
+          string in one pass (model_validate_json) and coerces it into a Python dict.
           If parsing or validation fails, falls back to {"text": raw_string}.
 
     Parameters:
@@ -31,6 +31,8 @@ class SchemaEnforcerAgent:
       wrap_key   : Reserved for compatibility; unused in this minimal implementation
     """
 
+    __slots__ = ("mode", "prefer_key", "schema", "wrap_key")
+
     def __init__(
         self,
         *,
@@ -48,6 +50,9 @@ class SchemaEnforcerAgent:
         :param wrap_key: Currently unused; kept for API compatibility.
         """
         assert mode in ("text", "json"), "mode must be either 'text' or 'json'"
+        # Check the schema type once here instead of on every invocation
+        if schema is not None and not issubclass(schema, PydBaseModel):
+            raise TypeError("schema must be a subclass of Pydantic BaseModel")
         self.mode = mode
         self.prefer_key = prefer_key
         self.schema = schema
@@ -64,8 +69,9 @@ class SchemaEnforcerAgent:
                - Return {"text": <string>}
           3. In json mode:
                - Extract the same way as above
-               - Try json.loads to parse it
-               - If schema is provided, validate/normalize via Pydantic
+               - If schema is provided, parse + validate in one pass via
+                 schema.model_validate_json
+               - Otherwise, parse with json.loads
                - On any failure, fall back to {"text": raw}
           4. Log the end event with output previews.
           5. Return the normalized output dict.
@@ -74,12 +80,15 @@ class SchemaEnforcerAgent:
 
         # TEXT MODE
         if self.mode == "text":
-            text = str(
-                state.get(self.prefer_key)
-                or state.get("text")
-                or state.get("draft")
-                or ""
-            )
+            text = state.get(self.prefer_key)
+            # Fast path: prefer_key already holds a non-empty string
+            if not (isinstance(text, str) and text):
+                text = str(
+                    text
+                    or state.get("text")
+                    or state.get("draft")
+                    or ""
+                )
             out = {"text": text}
             log_invoke_end(log, "SchemaEnforcerAgent", t0, out)
             return out
@@ -94,14 +103,11 @@ class SchemaEnforcerAgent:
         source = str(raw)
 
         try:
-            obj = json.loads(source)  # Attempt to parse JSON
-
-            # If schema is set, validate with Pydantic v2
             if self.schema is not None:
-                from pydantic import BaseModel as PydBaseModel  # v2 ok for typing & runtime
-                if not issubclass(self.schema, PydBaseModel):
-                    raise TypeError("schema must be a subclass of Pydantic BaseModel")
-                obj = self.schema.model_validate(obj).model_dump()
+                # Parse + validate in a single pass (Pydantic v2 JSON parser)
+                obj = self.schema.model_validate_json(source).model_dump()
+            else:
+                obj = json.loads(source)  # Attempt to parse JSON
 
             out: Dict[str, Any] = {"json": obj}
 
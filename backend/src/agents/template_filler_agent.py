@@ -1,11 +1,50 @@
 from __future__ import annotations
-from typing import Mapping, Dict, Any
+from typing import Mapping, Dict, Any, Optional, Tuple
+import string
 
 from ..config import get_logger
 from ..core.instrumentation import log_invoke_start, log_invoke_end
 
 log = get_logger(__name__)
 
+_FMT = string.Formatter()
+
+# One compiled step: (literal_text, field_name, format_spec, conversion)
+_Step = Tuple[str, Optional[str], str, Optional[str]]
+
+def _compile_template(template: str) -> Optional[Tuple[_Step, ...]]:
+    """
+    Partially evaluate a `.format()` template once: split it into literal
+    chunks and field lookups so `invoke` only has to look up and join.
+
+    Returns None when the template cannot be precompiled (malformed, or a
+    format spec with nested `{...}` fields); callers then use `str.format_map`.
+    """
+    try:
+        plan = tuple(_FMT.parse(template))
+    except ValueError:
+        return None
+    if any(spec and "{" in spec for _, _, spec, _ in plan):
+        return None
+    return plan
+
+def _render(plan: Tuple[_Step, ...], state: Mapping[str, Any]) -> str:
+    """Execute a compiled template plan against `state`."""
+    chunks = []
+    for literal, field, spec, conversion in plan:
+        if literal:
+            chunks.append(literal)
+        if field is None:
+            continue
+        if field.isidentifier():
+            obj = state[field]  # common case: plain "{name}"
+        else:
+            obj, _ = _FMT.get_field(field, (), state)  # "{a.b}", "{a[0]}", "{}" ...
+        if conversion:
+            obj = _FMT.convert_field(obj, conversion)
+        chunks.append(format(obj, spec or ""))
+    return "".join(chunks)
+
 class TemplateFillerAgent:
     """
     Fills a Python `.format()`-style string template with values from the current state.
@@ -22,14 +61,19 @@ class TemplateFillerAgent:
                     in the returned output (default is `"text"`).
 
     Behavior:
-      - Uses Python's built-in `str.format(**state)` for substitution.
+      - The template is parsed once at init into literal chunks + field lookups;
+        `invoke` only looks up the referenced state keys and joins the pieces
+        (same result as `str.format(**state)`).
       - If a placeholder's key is missing from the state, or if formatting
         raises any exception, the original template is returned unchanged
         (non-strict mode — avoids failure).
     """
+    __slots__ = ("template", "output_key", "_plan")
+
     def __init__(self, template: str, *, output_key: str = "text"):
         self.template = template
         self.output_key = output_key
+        self._plan = _compile_template(template)
 
     def invoke(self, state: Mapping[str, Any]) -> Dict[str, Any]:
         """
@@ -37,8 +81,8 @@ class TemplateFillerAgent:
 
         Steps:
           1. Log the start event with a preview of the state.
-          2. Attempt to call `.format(**state)` on the template.
-             - `state` is converted to a dict in case it's not a plain dict.
+          2. Render the precompiled template plan, pulling only the referenced
+             placeholder keys from `state` (no full copy, no re-parsing).
           3. On any exception (missing keys, type errors, bad formatting), fall
              back to returning the raw template unchanged.
           4. Store the filled (or unchanged) value under `output_key` in the
@@ -48,7 +92,10 @@ class TemplateFillerAgent:
         """
         t0 = log_invoke_start(log, "TemplateFillerAgent", state)
         try:
-            value = self.template.format(**dict(state))
+            if self._plan is not None:
+                value = _render(self._plan, state)
+            else:
+                value = self.template.format_map(state)
         except Exception:
             value = self.template  # non-strict fallback
         out = {self.output_key: value}
@@ -31,6 +31,8 @@ class PythonToolAgent:
             Optional custom ToolRegistry; defaults to the global registry.
     """
 
+    __slots__ = ("tool_name", "output_key", "kwargs_from_state", "_kv", "registry")
+
     def __init__(
         self,
         tool_name: str,
@@ -42,6 +44,8 @@ class PythonToolAgent:
         self.tool_name = tool_name
         self.output_key = output_key
         self.kwargs_from_state = kwargs_from_state or {}
+        # Frozen (param, state_key) pairs iterated on every call
+        self._kv = tuple(self.kwargs_from_state.items())
         self.registry = registry or default_registry
 
     def _build_kwargs(self, state: Mapping[str, Any]) -> Dict[str, Any]:
@@ -54,10 +58,7 @@ class PythonToolAgent:
         Returns:
             dict: Arguments to pass to the tool.
         """
-        return {
-            param: state.get(src_key)
-            for param, src_key in self.kwargs_from_state.items()
-        }
+        return {param: state.get(src_key) for param, src_key in self._kv}
 
     def invoke(self, state: Mapping[str, Any]) -> Dict[str, Any]:
         """
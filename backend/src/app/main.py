@@ -36,30 +36,33 @@ curl -X POST localhost:8000/composites/test-graph/invoke \
 
 '''
 from __future__ import annotations
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from uuid import uuid4
 
 from ..config import Config, init_logging, get_logger
-from ..tools.registry import registry
-from ..tools.date_tool import get_today_iso
+from ..tools import date_tool, string_tool  # noqa: F401  (tools register themselves on import)
 from ..core.context import set_request_id
+from ..composite_agents.test_graph import TestGraphComposite
 
 from .routes.composite_test import router as test_graph_router  # add this file (see below)
 
 log = get_logger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Build composites (agents + compiled graphs) once per process; routes reuse them
+    app.state.composites = {"test_graph": TestGraphComposite()}
+    yield
+    app.state.composites.clear()
+
 def create_app() -> FastAPI:
     # Config + JSON logging
     cfg = Config.load()
     init_logging(cfg)
 
-    # Tool registry (safe to call multiple times; last one wins)
-    # TODO: we should steup all tool in globl folder in register.py / but keep the functionality of register runable.
-    # So that we don't need to import all tool needed 
-    registry.register("date.today", get_today_iso)
-    registry.register("string.mark_double", lambda s: f"double::{s}") ## register our own vertual tool. [TEST]
-
-    app = FastAPI(title="Agent Backend", version="0.1.0")
+    app = FastAPI(title="Agent Backend", version="0.1.0", lifespan=lifespan)
+    app.state.cfg = cfg  # loaded once; routes read it via Depends(get_cfg)
 
     # Routers
     app.include_router(test_graph_router)  # ⬅️ expose the test composite
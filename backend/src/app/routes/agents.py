@@ -2,10 +2,12 @@
 from __future__ import annotations
 
 import time
-import inspect
+import asyncio
+from collections import OrderedDict
+from functools import lru_cache
 from typing import Any, Dict, List, Optional, Callable, cast
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Depends, Request
 from pydantic import BaseModel, Field
 
 from ...config import Config, get_logger
@@ -59,6 +61,12 @@ class TemplateFillerInvokeRequest(BaseModel):
 
 
 # ---------- Helpers ----------
+@lru_cache(maxsize=None)
+def _ainvoke_is_coroutine(agent_cls: type) -> bool:
+    """Whether `agent_cls.ainvoke` is an `async def` (introspected once per class)."""
+    return asyncio.iscoroutinefunction(getattr(agent_cls, "ainvoke", None))
+
+
 async def _invoke_agent_maybe_async(agent: Any, state: Dict[str, Any], async_mode: bool) -> Dict[str, Any]:
     """
     Call agent. Prefer ainvoke when async_mode=True and available.
@@ -67,9 +75,12 @@ async def _invoke_agent_maybe_async(agent: Any, state: Dict[str, Any], async_mod
     if async_mode:
         maybe = getattr(agent, "ainvoke", None)
         if callable(maybe):
-            result = maybe(state)
-            if inspect.isawaitable(result):
-                result = await result
+            if _ainvoke_is_coroutine(type(agent)):
+                result = await maybe(state)
+            else:
+                result = maybe(state)
+                if hasattr(result, "__await__"):  # sync ainvoke returning an awaitable
+                    result = await result
             if not isinstance(result, dict):
                 raise HTTPException(500, f"Agent {type(agent).__name__} returned non-dict from ainvoke: {type(result).__name__}")
             return cast(Dict[str, Any], result)
@@ -81,6 +92,11 @@ async def _invoke_agent_maybe_async(agent: Any, state: Dict[str, Any], async_mod
     return cast(Dict[str, Any], result)
 
 
+def get_cfg(request: Request) -> Config:
+    """Config loaded once at startup by create_app (see app.state.cfg)."""
+    return request.app.state.cfg
+
+
 def _normalize(name: str) -> str:
     return name.replace("-", "").replace("_", "").lower()
 
@@ -88,8 +104,7 @@ def _normalize(name: str) -> str:
 # ---------- Specialized endpoints FIRST ----------
 @router.post("/python-tool/invoke", response_model=InvokeResponse)
 async def invoke_python_tool(req: PythonToolInvokeRequest) -> InvokeResponse:
-    cfg = Config.load()
-    t0 = time.perf_counter()
+    t0 = time.perf_counter_ns()
 
     agent = PythonToolAgent(
         tool_name=req.args.tool_name,
@@ -98,13 +113,13 @@ async def invoke_python_tool(req: PythonToolInvokeRequest) -> InvokeResponse:
     )
     out: Dict[str, Any] = await _invoke_agent_maybe_async(agent, req.state, req.async_mode)
 
-    ms = int((time.perf_counter() - t0) * 1000)
+    ms = (time.perf_counter_ns() - t0) // 1_000_000
     return InvokeResponse(agent="PythonToolAgent", ms=ms, state_in=req.state, state_out=out)
 
 
 @router.post("/template-filler/invoke", response_model=InvokeResponse)
 async def invoke_template_filler(req: TemplateFillerInvokeRequest) -> InvokeResponse:
-    t0 = time.perf_counter()
+    t0 = time.perf_counter_ns()
 
     agent = TemplateFillerAgent(
         template=req.args.template,
@@ -112,7 +127,7 @@ async def invoke_template_filler(req: TemplateFillerInvokeRequest) -> InvokeResp
     )
     out: Dict[str, Any] = await _invoke_agent_maybe_async(agent, req.state, req.async_mode)
 
-    ms = int((time.perf_counter() - t0) * 1000)
+    ms = (time.perf_counter_ns() - t0) // 1_000_000
     return InvokeResponse(agent="TemplateFillerAgent", ms=ms, state_in=req.state, state_out=out)
 
 
@@ -146,26 +161,64 @@ def list_agents() -> List[str]:
     return sorted(list(AGENT_BUILDERS.keys()) + ["python-tool*", "template-filler*"])
 
 
+# Built agents keyed on (normalized name, id(cfg), frozen args). All agents above are
+# stateless after __init__, so reusing an instance across requests is safe. Builders
+# read cfg, so a reloaded Config gets fresh agents; each entry keeps its cfg alive
+# so the id cannot be reused while the entry exists.
+_AGENT_CACHE_SIZE = 256
+_AGENT_CACHE: "OrderedDict[Any, Any]" = OrderedDict()
+
+
+def _freeze(v: Any) -> Any:
+    """
+    Recursively turn dicts/lists/sets into hashable tuples for cache keys.
+    Containers are tagged and scalars carry their type, so args that merely compare
+    equal ({"a": 1} vs [["a", 1]], 1 vs True vs 1.0) never share a cached agent.
+    """
+    if isinstance(v, dict):
+        return ("d", tuple(sorted((k, _freeze(x)) for k, x in v.items())))
+    if isinstance(v, (list, tuple)):
+        return ("l", tuple(_freeze(x) for x in v))
+    if isinstance(v, (set, frozenset)):
+        return ("s", frozenset(_freeze(x) for x in v))
+    return (type(v), v)
+
+
 def _build_agent_or_404(agent_name: str, cfg: Config, args: Dict[str, Any]) -> Any:
     key = _normalize(agent_name)
     if key not in AGENT_BUILDERS:
         raise HTTPException(404, f"Unknown agent: {agent_name}")
+
     try:
-        return AGENT_BUILDERS[key](cfg, args)
+        cache_key: Any = (key, id(cfg), _freeze(args))
+        hash(cache_key)
+    except TypeError:
+        cache_key = None  # unhashable arg values: build without caching
+    if cache_key is not None and cache_key in _AGENT_CACHE:
+        _AGENT_CACHE.move_to_end(cache_key)
+        return _AGENT_CACHE[cache_key][1]
+
+    try:
+        agent = AGENT_BUILDERS[key](cfg, args)
     except TypeError as e:
         raise HTTPException(400, f"Invalid args for {agent_name}: {e}") from e
     except Exception as e:
         raise HTTPException(500, f"Failed to build agent {agent_name}: {e}") from e
 
+    if cache_key is not None:
+        _AGENT_CACHE[cache_key] = (cfg, agent)
+        if len(_AGENT_CACHE) > _AGENT_CACHE_SIZE:
+            _AGENT_CACHE.popitem(last=False)
+    return agent
+
 
 # ---------- Generic invoke (after specialized endpoints) ----------
 @router.post("/{agent_name}/invoke", response_model=InvokeResponse)
-async def invoke_agent(agent_name: str, req: InvokeRequest) -> InvokeResponse:
-    cfg = Config.load()
-    t0 = time.perf_counter()
+async def invoke_agent(agent_name: str, req: InvokeRequest, cfg: Config = Depends(get_cfg)) -> InvokeResponse:
+    t0 = time.perf_counter_ns()
 
     agent = _build_agent_or_404(agent_name, cfg, req.args)
     out: Dict[str, Any] = await _invoke_agent_maybe_async(agent, req.state, req.async_mode)
 
-    ms = int((time.perf_counter() - t0) * 1000)
+    ms = (time.perf_counter_ns() - t0) // 1_000_000
     return InvokeResponse(agent=agent_name, ms=ms, state_in=req.state, state_out=out)
@@ -1,20 +1,28 @@
 from __future__ import annotations
 from typing import Dict, Any
-from fastapi import APIRouter
-from pydantic import BaseModel
-
-from ...composite_agents.test_graph import TestGraphComposite
+import orjson
+from fastapi import APIRouter, HTTPException, Request
 
 router = APIRouter(prefix="/composites/test-graph", tags=["composites"])
 
-# Stateless is fine: create per-request or cache a singleton.
-# Here we keep it simple and build per-call; swap to a module-level singleton if needed.
+# The composite is stateless w.r.t. `self` (all per-request data lives in the
+# graph state), so one instance is built in the app lifespan and shared
+# (see app.main.lifespan → app.state.composites).
 # TODO: globl stat management
 # * since now is just local state for each request
-class InvokeBody(BaseModel):
-    state: Dict[str, Any] = {}
 
+# Request body: {"state": {...}}. Parsed with orjson directly instead of a
+# Pydantic model.
 @router.post("/invoke")
-def invoke_test_graph(body: InvokeBody) -> Dict[str, Any]:
-    comp = TestGraphComposite()
-    return comp.invoke(body.state)
+async def invoke_test_graph(request: Request) -> Dict[str, Any]:
+    raw = await request.body()
+    try:
+        body = orjson.loads(raw) if raw else {}
+    except orjson.JSONDecodeError as e:
+        raise HTTPException(400, f"Invalid JSON body: {e}") from e
+    state = body.get("state", {}) if isinstance(body, dict) else None
+    if not isinstance(state, dict):
+        raise HTTPException(422, "'state' must be a JSON object")
+
+    comp = request.app.state.composites["test_graph"]
+    return await comp.ainvoke(state)
@@ -14,23 +14,21 @@
 #
 # Why this file is useful as a template:
 #   - Shows a tidy way to define a graph “state”, and to keep each node tiny.
-#   - Wraps node callables with RunnableLambda so LangGraph type expectations are happy.
+#   - Registers plain bound methods as nodes (LangGraph accepts any `(state) -> delta` callable).
 #   - Demonstrates mixing universal prompts (registry) + composite-local prompts.
 #   - Demonstrates using a tool by NAME via a registry (no hard dependency on function symbols).
 #   - Ends with a SchemaEnforcer so every composite returns the same contract: {"text": "..."}.
 #
 # How to extend:
-#   - Add a new node: write a small `(state) -> delta` function and wire it with `g.add_node("name", rl(self._n_name))`.
+#   - Add a new node: write a small `(state) -> delta` function and wire it with `g.add_node("name", self._n_name)`.
 #   - Add a new route: update `_route_from_letters` (or write a separate router node), then add conditional edges.
 #   - Swap the tool: register a different callable under the same name at startup (see note near TOOL_REGISTRY).
-#   - Make it async later: add `ainvoke` with the same steps and await LLM-backed agents (they already support async).
+#   - Async: `ainvoke` drives the same graph via `graph.ainvoke` (used by the FastAPI route).
 
 from __future__ import annotations
-from typing import Dict, Any, Mapping, Literal, TypedDict, Callable, cast
-import re
+from typing import Dict, Any, Mapping, Literal, TypedDict, cast
 
 from langgraph.graph import StateGraph, END
-from langchain_core.runnables import RunnableLambda  # wraps plain functions as graph nodes
 
 # Universal (reusable) agents
 from ...agents.llm_runner_agent import LLMRunnerAgent
@@ -44,9 +42,10 @@ from ...prompts import get_prompt
 # Composite-local prompt (only used by this composite)
 from .prompts.local_filler_prompt import LOCAL_FILLER_PROMPT
 
-# Central tool registry. At app startup do:
-#   registry.register("string.mark_double", lambda s: f"double::{s}")
+# Central tool registry. Tools register themselves when their module is
+# imported (e.g. tools/string_tool.py registers "string.mark_double").
 from ...tools.registry import registry as TOOL_REGISTRY
+from ...tools import string_tool  # noqa: F401
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -75,9 +74,8 @@ class HasRoute(TypedDict):
     route: Literal["TRIPLE", "DOUBLE", "NONE"]
 
 
-# Small helper to wrap node functions as Runnables for LangGraph
-def rl(func: Callable[[GraphState], Dict[str, Any]]) -> RunnableLambda:
-    return RunnableLambda(func)
+# bytes.translate delete-table: every byte except a-z (built once at import)
+_NON_LOWER_ASCII = bytes(b for b in range(256) if not 0x61 <= b <= 0x7A)
 
 
 class TestGraphComposite:
@@ -90,6 +88,7 @@ class TestGraphComposite:
 
     Public contract:
       .invoke({"user_input": ...}) -> {"text": "..."}
+      .ainvoke({"user_input": ...}) -> {"text": "..."}   (async)
     """
 
     # ── Setup: create agent instances (DI-friendly; YAML agent overrides apply) ──
@@ -118,7 +117,8 @@ class TestGraphComposite:
     @staticmethod
     def _extract_letters(text: str) -> str:
         """Keep only [a-z], lowercased; ensure exactly 6 chars (pad conservatively if short)."""
-        letters = "".join(re.findall(r"[a-z]", text.lower()))
+        # One C-level pass: lowercase, drop non-ASCII, delete everything outside a-z
+        letters = text.lower().encode("ascii", "ignore").translate(None, _NON_LOWER_ASCII).decode("ascii")
         if len(letters) >= 6:
             return letters[:6]
         while len(letters) < 6 and letters:
@@ -128,19 +128,12 @@ class TestGraphComposite:
     @staticmethod
     def _route_from_letters(letters: str) -> str:
         """Return TRIPLE / DOUBLE / NONE based on consecutive runs."""
-        if not letters:
-            return "NONE"
-        runs, streak = [], 1
-        for i in range(1, len(letters)):
-            if letters[i] == letters[i - 1]:
-                streak += 1
-            else:
-                runs.append(streak)
-                streak = 1
-        runs.append(streak)
-        if any(r >= 3 for r in runs):
+        # pairs[i]: letters[i] == letters[i+1]. Two adjacent equal pairs form a
+        # run of >= 3; otherwise any equal pair is a run of exactly 2.
+        pairs = [a == b for a, b in zip(letters, letters[1:])]
+        if any(p and q for p, q in zip(pairs, pairs[1:])):
             return "TRIPLE"
-        if any(r == 2 for r in runs):
+        if any(pairs):
             return "DOUBLE"
         return "NONE"
 
@@ -205,30 +198,34 @@ class TestGraphComposite:
 
     # Shared: normalize to {"text": "..."}
     def _n_schema(self, state: GraphState) -> Dict[str, Any]:
+        # Upstream nodes usually already set a non-empty `text`: nothing to normalize
+        t = state.get("text")
+        if isinstance(t, str) and t:
+            return {"text": t}
         return self.schema.invoke(state)
 
-    # ── Graph wiring: use RunnableLambda to satisfy LangGraph’s node type ──
+    # ── Graph wiring: plain callables as nodes (no RunnableLambda wrapper) ──
     def _build_graph(self):
         g = StateGraph(GraphState)
 
-        g.add_node("runner", rl(self._n_runner))
-        g.add_node("router", rl(self._n_router))
+        g.add_node("runner", self._n_runner)
+        g.add_node("router", self._n_router)
 
         # TRIPLE
-        g.add_node("filler_global", rl(self._n_filler_global))
-        g.add_node("filler_local", rl(self._n_filler_local))
+        g.add_node("filler_global", self._n_filler_global)
+        g.add_node("filler_local", self._n_filler_local)
 
         # DOUBLE
-        g.add_node("tool_annotate", rl(self._n_tool_annotate))
-        g.add_node("uppercase_after_tool", rl(self._n_uppercase_after_tool))
+        g.add_node("tool_annotate", self._n_tool_annotate)
+        g.add_node("uppercase_after_tool", self._n_uppercase_after_tool)
 
         # NONE
-        g.add_node("sentence_local", rl(self._n_sentence_local))
-        g.add_node("rule_len8", rl(self._n_rule_len8))
-        g.add_node("uppercase_final", rl(self._n_uppercase_final))
+        g.add_node("sentence_local", self._n_sentence_local)
+        g.add_node("rule_len8", self._n_rule_len8)
+        g.add_node("uppercase_final", self._n_uppercase_final)
 
         # Shared
-        g.add_node("schema", rl(self._n_schema))
+        g.add_node("schema", self._n_schema)
 
         g.set_entry_point("runner")
         g.add_edge("runner", "router")
@@ -268,3 +265,9 @@ class TestGraphComposite:
         init: GraphState = {"user_input": str(state_in.get("user_input", ""))}
         out = self._graph.invoke(init)
         return {"text": str(out.get("text", ""))}
+
+    async def ainvoke(self, state_in: Mapping[str, Any]) -> Dict[str, Any]:
+        """Async twin of `invoke` for ASGI routes; the event loop stays free while nodes run."""
+        init: GraphState = {"user_input": str(state_in.get("user_input", ""))}
+        out = await self._graph.ainvoke(init)
+        return {"text": str(out.get("text", ""))}
@@ -2,38 +2,88 @@
 from __future__ import annotations
 
 import os
+import copy
 import json
-from dataclasses import dataclass, field, asdict
+from functools import lru_cache
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, Optional
-from google.oauth2.service_account import Credentials as _SACredentials
-import vertexai
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, TYPE_CHECKING
 
+import orjson
 import yaml
 
+# google-auth / vertexai pull in grpc + aiplatform (slow); import them only in
+# the methods that need them so logging/config-only imports stay light.
+if TYPE_CHECKING:
+    from google.oauth2.service_account import Credentials as _SACredentials
+
 DEFAULT_YAML = Path(__file__).with_name("default.yaml")
+# src/.keys (resolved once at import, not per credential lookup)
+_KEYS_DIR = Path(__file__).resolve().parents[1] / ".keys"
+
+# libyaml-backed loader when PyYAML was built with it (pure-Python fallback otherwise)
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
 # --------- helpers ---------
+@lru_cache(maxsize=32)
+def _parse_config_file(path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """Parse a config file once per (path, mtime, size); edits on disk invalidate the entry."""
+    p = Path(path)
+    if p.suffix == ".json":
+        return orjson.loads(p.read_bytes()) or {}
+    with p.open("r", encoding="utf-8") as f:
+        return yaml.load(f, Loader=_YamlLoader) or {}
+
 def _load_yaml(p: Path) -> Dict[str, Any]:
-    if not p.exists():
+    try:
+        st = p.stat()
+    except FileNotFoundError:
         return {}
-    with p.open("r", encoding="utf-8") as f:
-        return yaml.safe_load(f) or {}
+    # Size joins mtime in the key: catches same-tick rewrites on coarse-mtime filesystems.
+    # Copy so callers (Config.load keeps sub-dicts) never mutate the cached parse
+    return copy.deepcopy(_parse_config_file(str(p.resolve()), st.st_mtime_ns, st.st_size))
+
+@lru_cache(maxsize=8)
+def _load_sa_credentials(path: str, mtime_ns: int) -> "_SACredentials":
+    """Parse a service-account key once per (path, mtime); shared by every builder call."""
+    from google.oauth2.service_account import Credentials as _SACredentials
+    return _SACredentials.from_service_account_file(
+        path,
+        scopes=["https://www.googleapis.com/auth/cloud-platform"],
+    )
 
-def _env_bool(name: str, default: bool = False) -> bool:
-    v = os.getenv(name)
+def _env_bool(name: str, default: bool = False, env: Mapping[str, Optional[str]] = os.environ) -> bool:
+    v = env.get(name)
     if v is None:
         return default
     return str(v).lower() in ("1", "true", "yes", "on")
 
-def _coalesce_env(*names: str, default: Optional[str] = None) -> Optional[str]:
+def _set_env(name: str, value: str) -> None:
+    if os.environ.get(name) != value:
+        os.environ[name] = value
+
+def _coalesce_env(*names: str, default: Optional[str] = None,
+                  env: Mapping[str, Optional[str]] = os.environ) -> Optional[str]:
     for n in names:
-        if os.getenv(n):
-            return os.getenv(n)
+        v = env.get(n)  # one lookup per name
+        if v:
+            return v
     return default
 
+_UNSET = object()
+
+# Every env var Config._load_uncached reads; part of the Config.load memo key
+_CONFIG_ENV_VARS = (
+    "GOOGLE_CLOUD_PROJECT", "GCP_PROJECT",
+    "GOOGLE_CLOUD_REGION", "GOOGLE_CLOUD_LOCATION",
+    "VERTEX_API_ENDPOINT", "GOOGLE_APPLICATION_CREDENTIALS", "USE_ADC",
+)
+
 # --------- dataclasses for config ---------
-@dataclass
+# All config dataclasses are frozen: a Config is immutable once loaded, which lets
+# it precompute derived values (e.g. the base LLM kwargs) safely.
+@dataclass(frozen=True)
 class LLMDefaults:
     model_name: str = "gemini-2.0-flash"
     temperature: float = 0.2
@@ -46,7 +96,7 @@ class LLMDefaults:
     stop_sequences: list[str] = field(default_factory=list)
     timeout: int = 60
 
-@dataclass
+@dataclass(frozen=True)
 class LoggingDefaults:
     level: str = "INFO"
     format: str = "json"  # json | pretty
@@ -55,7 +105,7 @@ class LoggingDefaults:
     rotate_mb: int = 10
     rotate_backups: int = 5
 
-@dataclass
+@dataclass(frozen=True)
 class Config:
     # Source info (optional, handy for debugging)
     _source: str = "defaults"
@@ -84,19 +134,81 @@ class Config:
         "multiplier": 2.0,
     })
 
+    # Derived: global LLM kwargs, built once in __post_init__ (see llm_kwargs)
+    _llm_base: Dict[str, Any] = field(init=False, repr=False, compare=False)
+    # Memo: agent name (None = global) -> merged llm kwargs, filled by llm_kwargs
+    _agent_llm_kwargs: Dict[Optional[str], Dict[str, Any]] = field(
+        init=False, repr=False, compare=False, default_factory=dict)
+    # Memo for credential_path() (None is a valid result, hence the sentinel)
+    _cred_path: Any = field(init=False, repr=False, compare=False, default=_UNSET)
+    # Memos for retry_policy() / logging_config() (read-only views, built on first call)
+    _retry_policy: Optional[Mapping[str, Any]] = field(init=False, repr=False, compare=False, default=None)
+    _logging_config: Optional[Mapping[str, Any]] = field(init=False, repr=False, compare=False, default=None)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "_llm_base", {
+            "project": self.project,
+            "location": self.location,
+            "model": self.llm.model_name,
+            "temperature": self.llm.temperature,
+            "top_p": self.llm.top_p,
+            "top_k": int(self.llm.top_k),
+            "candidate_count": int(self.llm.candidate_count),
+            "max_output_tokens": int(self.llm.max_output_tokens),
+            "response_mime_type": self.llm.response_mime_type,
+            "system_instruction": self.llm.system_instruction,
+            "stop_sequences": list(self.llm.stop_sequences or []),
+            "timeout_s": int(self.llm.timeout),
+            # api_endpoint is optional and only used if your SDK supports it
+            "api_endpoint": self.api_endpoint,
+        })
+
     # ---------- Loading ----------
     @classmethod
     def load(cls, yaml_path: Path = DEFAULT_YAML) -> "Config":
+        """
+        Load config from YAML + env. Memoized per process: the same file (unchanged
+        on disk) under the same env overrides returns the same frozen instance.
+        """
+        p = Path(yaml_path)
+        try:
+            st = p.stat()
+            stamp: Optional[tuple] = (st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            stamp = None
+        # Single env snapshot: used both as memo key and as the loader's env source
+        env = tuple(os.getenv(n) for n in _CONFIG_ENV_VARS)
+        return _load_config_cached(cls, p, stamp, env)
+
+    @classmethod
+    def reload(cls, yaml_path: Path = DEFAULT_YAML) -> "Config":
+        """Drop the memoized configs (and parsed YAML) and load a fresh instance, e.g. in tests."""
+        _load_config_cached.cache_clear()
+        _parse_config_file.cache_clear()
+        return cls.load(yaml_path)
+
+    @classmethod
+    def _load_uncached(cls, yaml_path: Path, env: Mapping[str, Optional[str]]) -> "Config":
         y = _load_yaml(yaml_path)
 
-        # 1) Start from YAML
+        # 1) Env overrides (highest priority) on top of YAML values
+        project = _coalesce_env("GOOGLE_CLOUD_PROJECT", "GCP_PROJECT", default=y.get("project"), env=env)
+        location = _coalesce_env("GOOGLE_CLOUD_REGION", "GOOGLE_CLOUD_LOCATION", default=y.get("location"), env=env)
+        api_endpoint = env.get("VERTEX_API_ENDPOINT")
+        if api_endpoint is None:
+            api_endpoint = y.get("api_endpoint")
+        # If user points to a direct credentials file via env, prefer that:
+        # (typical Google SDK var)
+        credentials_name = env.get("GOOGLE_APPLICATION_CREDENTIALS") or y.get("credentials_name")  # absolute path
+
+        # 2) Build the (frozen) config
         cfg = cls(
             _source=f"file:{yaml_path}" if y else "defaults",
-            project=y.get("project"),
-            location=y.get("location"),
-            api_endpoint=y.get("api_endpoint"),
-            credentials_name=y.get("credentials_name"),
-            use_adc=_env_bool("USE_ADC", False),
+            project=project,
+            location=location,
+            api_endpoint=api_endpoint,
+            credentials_name=credentials_name,
+            use_adc=_env_bool("USE_ADC", False, env=env),
             llm=LLMDefaults(
                 model_name=y.get("model_name", LLMDefaults.model_name),
                 temperature=y.get("temperature", LLMDefaults.temperature),
@@ -121,16 +233,6 @@ class Config:
             retry=y.get("retry", {}) or {},
         )
 
-        # 2) Env overrides (highest priority)
-        cfg.project = _coalesce_env("GOOGLE_CLOUD_PROJECT", "GCP_PROJECT", default=cfg.project)
-        cfg.location = _coalesce_env("GOOGLE_CLOUD_REGION", "GOOGLE_CLOUD_LOCATION", default=cfg.location)
-        cfg.api_endpoint = os.getenv("VERTEX_API_ENDPOINT", cfg.api_endpoint)
-        # If user points to a direct credentials file via env, prefer that:
-        # (typical Google SDK var)
-        env_cred = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
-        if env_cred:
-            cfg.credentials_name = env_cred  # absolute path
-
         # 3) Final sanity
         if not cfg.project or not cfg.location:
             raise RuntimeError("Config missing GCP 'project' or 'location' (YAML or env).")
@@ -139,7 +241,16 @@ class Config:
 
     # ---------- Auth resolution ----------
     def credential_path(self) -> Optional[Path]:
-        """Resolve local credentials file path when USE_ADC=false."""
+        """
+        Resolve local credentials file path when USE_ADC=false.
+        Resolved (stat/resolve) once per Config; the result is memoized.
+        """
+        if self._cred_path is _UNSET:
+            p = self._find_credential_path()
+            object.__setattr__(self, "_cred_path", p.resolve() if p is not None else None)
+        return self._cred_path
+
+    def _find_credential_path(self) -> Optional[Path]:
         if self.use_adc:
             return None
         # If credentials_name looks like an absolute path (from env), use it
@@ -147,8 +258,7 @@ class Config:
             return Path(self.credentials_name)
         # Otherwise resolve from src/.keys/<credentials_name>
         if self.credentials_name:
-            keys_dir = Path(__file__).resolve().parents[1] / ".keys"
-            candidate = keys_dir / self.credentials_name
+            candidate = _KEYS_DIR / self.credentials_name
             if candidate.exists():
                 return candidate
         # No local key => rely on GOOGLE_APPLICATION_CREDENTIALS or ADC
@@ -162,18 +272,19 @@ class Config:
         - If use_adc=True: ensure GOOGLE_APPLICATION_CREDENTIALS is unset (SDK will use ADC).
         - Else: set GOOGLE_APPLICATION_CREDENTIALS to the resolved key file path (if any).
         Always set GOOGLE_CLOUD_PROJECT / GOOGLE_CLOUD_REGION for downstream libs.
+        Values already in place are left alone, so repeat calls do no putenv work.
         """
         if self.use_adc:
             os.environ.pop("GOOGLE_APPLICATION_CREDENTIALS", None)
         else:
             p = self.credential_path()
             if p is not None:
-                os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = str(p.resolve())
-        os.environ["GOOGLE_CLOUD_PROJECT"] = self.project or ""
-        os.environ["GOOGLE_CLOUD_REGION"] = self.location or ""
+                _set_env("GOOGLE_APPLICATION_CREDENTIALS", str(p))  # already resolved
+        _set_env("GOOGLE_CLOUD_PROJECT", self.project or "")
+        _set_env("GOOGLE_CLOUD_REGION", self.location or "")
 
     # ---------- Credentials object (for explicit injection) ----------
-    def load_credentials(self):
+    def load_credentials(self) -> Optional["_SACredentials"]:
         """
         Returns a google.oauth2.service_account.Credentials object when not using ADC.
         Returns None if use_adc=True or when no local key is configured.
@@ -181,19 +292,22 @@ class Config:
         if self.use_adc:
             return None
         p = self.credential_path()
-        if p is None or not p.exists():
+        if p is None:
             return None
-        return _SACredentials.from_service_account_file(
-            str(p),
-            scopes=["https://www.googleapis.com/auth/cloud-platform"],
-        )
+        try:
+            mtime_ns = p.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+        return _load_sa_credentials(str(p), mtime_ns)
 
     # ---------- Vertex endpoint bootstrap ----------
     def init_vertex(self, credentials=None) -> None:
         """
         Initialize the Vertex AI client with explicit named parameters.
         Using named args avoids Pylance '**kwargs' type confusion.
+        (llm.vertex.get_vertex_chat_model only calls this when its target changes.)
         """
+        import vertexai
         if credentials is None:
             vertexai.init(project=self.project, location=self.location)
         else:
@@ -206,55 +320,68 @@ class Config:
         - Global defaults
         - merged with per-agent overrides (if any)
         - merged with per-call overrides (**overrides)
+        Keys whose final value is None are omitted.
         """
-        base = {
-            "project": self.project,
-            "location": self.location,
-            "model": self.llm.model_name,
-            "temperature": self.llm.temperature,
-            "top_p": self.llm.top_p,
-            "top_k": int(self.llm.top_k),
-            "candidate_count": int(self.llm.candidate_count),
-            "max_output_tokens": int(self.llm.max_output_tokens),
-            "response_mime_type": self.llm.response_mime_type,
-            "system_instruction": self.llm.system_instruction,
-            "stop_sequences": list(self.llm.stop_sequences or []),
-            "timeout_s": int(self.llm.timeout),
-            # api_endpoint is optional and only used if your SDK supports it
-            "api_endpoint": self.api_endpoint,
-        }
-        if agent and agent in self.agents:
-            # Allow any fields above to be overridden by agent-scoped values
-            base.update(self.agents[agent])
-        # Runtime overrides win last
-        base.update(overrides)
+        # global <- agents.<agent> is invariant per agent: merge once, copy per call
+        key = agent if agent and agent in self.agents else None
+        merged = self._agent_llm_kwargs.get(key)
+        if merged is None:
+            merged = dict(self._llm_base)
+            if key is not None:
+                # Allow any fields above to be overridden by agent-scoped values
+                merged.update(self.agents[key])
+            merged = {k: v for k, v in merged.items() if v is not None}
+            self._agent_llm_kwargs[key] = merged
+
+        base = dict(merged)
+        if isinstance(base.get("stop_sequences"), list):
+            base["stop_sequences"] = list(base["stop_sequences"])  # don't share the cached list
+        if overrides:
+            # Runtime overrides win last
+            base.update(overrides)
+            # Drop unset values in place so callers can pass the dict straight through
+            if None in base.values():
+                for k in [k for k, v in base.items() if v is None]:
+                    del base[k]
         return base
 
     # ---------- Retry policy ----------
-    def retry_policy(self) -> Dict[str, Any]:
+    def retry_policy(self) -> Mapping[str, Any]:
         """
         Return app-level retry policy (for your own wrapper).
         You can implement the actual retry using this info.
+        Built once per Config and returned as a read-only mapping.
         """
-        return {
-            "max_attempts": int(self.retry.get("max_attempts", 3)),
-            "initial_backoff_s": float(self.retry.get("initial_backoff_s", 0.5)),
-            "max_backoff_s": float(self.retry.get("max_backoff_s", 8.0)),
-            "multiplier": float(self.retry.get("multiplier", 2.0)),
-        }
+        if self._retry_policy is None:
+            object.__setattr__(self, "_retry_policy", MappingProxyType({
+                "max_attempts": int(self.retry.get("max_attempts", 3)),
+                "initial_backoff_s": float(self.retry.get("initial_backoff_s", 0.5)),
+                "max_backoff_s": float(self.retry.get("max_backoff_s", 8.0)),
+                "multiplier": float(self.retry.get("multiplier", 2.0)),
+            }))
+        return self._retry_policy
 
     # ---------- Logging config ----------
-    def logging_config(self) -> Dict[str, Any]:
+    def logging_config(self) -> Mapping[str, Any]:
         """
         Produce a logging dict config (or your custom structure) based on YAML.
         Your logging_config.py can consume this to configure handlers/formatters.
+        Like retry_policy(), built once and returned read-only.
         """
-        return {
-            "level": self.logging.level,
-            "format": self.logging.format,
-            "include_request_id": bool(self.logging.include_request_id),
-            "file": self.logging.file,
-            "rotate_mb": int(self.logging.rotate_mb),
-            "rotate_backups": int(self.logging.rotate_backups),
-            "source": self._source,
-        }
+        if self._logging_config is None:
+            object.__setattr__(self, "_logging_config", MappingProxyType({
+                "level": self.logging.level,
+                "format": self.logging.format,
+                "include_request_id": bool(self.logging.include_request_id),
+                "file": self.logging.file,
+                "rotate_mb": int(self.logging.rotate_mb),
+                "rotate_backups": int(self.logging.rotate_backups),
+                "source": self._source,
+            }))
+        return self._logging_config
+
+
+@lru_cache(maxsize=4)
+def _load_config_cached(cls: type, yaml_path: Path, stamp: Optional[tuple], env: tuple) -> Config:
+    # failures (RuntimeError) are not cached
+    return cls._load_uncached(yaml_path, dict(zip(_CONFIG_ENV_VARS, env)))
@@ -1,13 +1,10 @@
 from __future__ import annotations
 import time
-import re
+import logging
 from typing import Mapping, Dict, Any, Iterable
 from logging import Logger
 
-from .context import get_request_id
-
-# Regex to normalize whitespace for previews
-_WS = re.compile(r"\s+")
+_MISSING = object()
 
 def _preview(val: Any, max_chars: int = 120) -> str:
     """
@@ -16,8 +13,7 @@ def _preview(val: Any, max_chars: int = 120) -> str:
     - Trim leading/trailing spaces.
     - Truncate to `max_chars` characters (adding ellipsis if truncated).
     """
-    s = str(val)
-    s = _WS.sub(" ", s).strip()
+    s = " ".join(str(val).split())  # collapse + trim whitespace in one C-level pass
     return (s[: max_chars - 1] + "…") if len(s) > max_chars else s
 
 def _pick_meta(state: Mapping[str, Any], keys: Iterable[str]) -> Dict[str, Any]:
@@ -30,10 +26,12 @@ def _pick_meta(state: Mapping[str, Any], keys: Iterable[str]) -> Dict[str, Any]:
     """
     out: Dict[str, Any] = {}
     for k in keys:
-        if k in state:
-            v = state[k]
-            out[f"{k}_preview"] = _preview(v)
-            out[f"{k}_len"] = len(str(v))
+        v = state.get(k, _MISSING)
+        if v is _MISSING:
+            continue
+        sv = v if isinstance(v, str) else str(v)  # stringify once for preview + len
+        out[f"{k}_preview"] = _preview(sv)
+        out[f"{k}_len"] = len(sv)
     return out
 
 def log_invoke_start(
@@ -47,21 +45,18 @@ def log_invoke_start(
 
     - Records the time for later duration calculation.
     - Logs input keys and previews of important text fields.
-    - Attaches request_id if available (for tracing across logs).
     - Merges any additional metadata from `extra`.
+    - Skips building the payload entirely when DEBUG is filtered out.
     """
     t0 = time.perf_counter()
+    if not log.isEnabledFor(logging.DEBUG):
+        return t0
     in_keys = sorted(state.keys())  # Keep a predictable order of keys
     meta = _pick_meta(state, ("user_input", "draft", "text"))
     payload = {"agent": agent, "stage": "start", "in_keys": in_keys, **meta}
     if extra:
         payload.update(extra)
 
-    # Attach request ID for correlation if available
-    rid = get_request_id()
-    if rid:
-        payload["request_id"] = rid
-
     # Debug-level logging for start of invocation
     log.debug("agent.invoke.start", extra=payload)
     return t0
@@ -79,9 +74,11 @@ def log_invoke_end(
     - Calculates elapsed time in milliseconds from `t0`.
     - Logs output keys and previews of key output fields.
     - Includes special fields like 'ok' and 'violations' if present.
-    - Attaches request_id for trace correlation.
     - Merges any additional metadata from `extra`.
+    - Like `log_invoke_start`, returns early when INFO is filtered out.
     """
+    if not log.isEnabledFor(logging.INFO):
+        return
     dt = int((time.perf_counter() - t0) * 1000)
     out_keys = sorted(out.keys())
     meta = _pick_meta(out, ("text", "draft", "route"))
@@ -108,10 +105,5 @@ def log_invoke_end(
     if extra:
         payload.update(extra)
 
-    # Attach request ID for correlation
-    rid = get_request_id()
-    if rid:
-        payload["request_id"] = rid
-
     # Info-level logging for end of invocation
     log.info("agent.invoke.end", extra=payload)
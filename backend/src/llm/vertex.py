@@ -1,8 +1,8 @@
 from __future__ import annotations
+from collections import OrderedDict
 from typing import Optional, Dict, Any
 
 from langchain_core.runnables import Runnable
-from langchain_google_vertexai import ChatVertexAI
 from ..config.config import Config
 
 # Ctor allow-list for your adapter version (keep minimal & safe)
@@ -24,25 +24,65 @@ _CALL_ALIASES = {
     # add more runtime-only mappings here if needed
 }
 
+# Precomputed routing: config key -> (is_ctor, target kwarg). Keys absent here are dropped.
+_KWARG_ROUTES: Dict[str, tuple[bool, str]] = {
+    **{k: (True, k) for k in _CTOR_ALLOWED},
+    **{k: (False, alias) for k, alias in _CALL_ALIASES.items()},
+}
+
 def _split_kwargs(raw: Dict[str, Any]) -> tuple[Dict[str, Any], Dict[str, Any]]:
     """
     Split config kwargs into:
       - ctor_kwargs: passed to ChatVertexAI(...)
       - call_kwargs: bound via llm.bind(**call_kwargs)
-    Drops unknown or None values safely.
+    Drops unknown keys safely (None values are already omitted by Config.llm_kwargs).
     """
     ctor: Dict[str, Any] = {}
     call: Dict[str, Any] = {}
     for k, v in raw.items():
-        if v is None:
-            continue
-        if k in _CTOR_ALLOWED:
-            ctor[k] = v
-        elif k in _CALL_ALIASES:
-            call[_CALL_ALIASES[k]] = v
+        route = _KWARG_ROUTES.get(k)
         # silently drop unsupported keys (e.g., candidate_count, system_instruction, api_endpoint)
+        if route is None:
+            continue
+        is_ctor, name = route
+        (ctor if is_ctor else call)[name] = v
     return ctor, call
 
+# Built adapters keyed on everything that shapes them: auth source (path + key mtime) +
+# final ctor/call kwargs. ChatVertexAI is stateless between calls, so one instance per key is reused
+# instead of re-reading credentials and re-creating the gRPC client on every build.
+_LLM_CACHE_SIZE = 32
+_LLM_CACHE: "OrderedDict[Any, Runnable]" = OrderedDict()
+
+# (project, location, use_adc, credential path, creds object) that env wiring + vertexai.init
+# last ran for. Creds are cached per key-file mtime, so a rotated key re-runs init.
+_initialized_for: Optional[tuple] = None
+
+def reset_vertex_cache() -> None:
+    """Forget cached adapters and the init guard (tests, or after swapping credentials)."""
+    global _initialized_for
+    _LLM_CACHE.clear()
+    _initialized_for = None
+
+def _cred_mtime(cfg: Config) -> Optional[int]:
+    """mtime of the service-account key file, so a key rotated in place gets a new adapter."""
+    p = cfg.credential_path()
+    if p is None:
+        return None
+    try:
+        return p.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+def _cache_key(cfg: Config, ctor: Dict[str, Any], call: Dict[str, Any]) -> Any:
+    try:
+        key = (cfg.use_adc, cfg.credential_path(), _cred_mtime(cfg),
+               tuple(sorted(ctor.items())), tuple(sorted(call.items())))
+        hash(key)
+    except TypeError:
+        return None  # unhashable override values: build without caching
+    return key
+
 def get_vertex_chat_model(
     cfg: Optional[Config] = None,
     agent: Optional[str] = None,
@@ -52,27 +92,44 @@ def get_vertex_chat_model(
     Build a Vertex chat LLM runnable:
       global defaults <- agents.<agent> <- **overrides
     Return value is a Runnable (ChatVertexAI or a bound wrapper) ready for LCEL: prompt | llm | parser.
+    Identical configurations share one cached instance.
     """
     cfg = cfg or Config.load()
 
-    # Wire env (ADC vs local SA)
-    cfg.apply_google_env()
+    # Prepare kwargs
+    raw = cfg.llm_kwargs(agent=agent, **overrides)
+    ctor_kwargs, call_kwargs = _split_kwargs(raw)
+
+    key = _cache_key(cfg, ctor_kwargs, call_kwargs)
+    if key is not None:
+        cached = _LLM_CACHE.get(key)
+        if cached is not None:
+            _LLM_CACHE.move_to_end(key)
+            return cached
 
     # Load explicit creds if any (None under ADC)
     creds = cfg.load_credentials()
 
-    # Initialize vertex client (use creds if present)
-    cfg.init_vertex(credentials=creds)
-
-    # Prepare kwargs
-    raw = cfg.llm_kwargs(agent=agent, **overrides)
-    ctor_kwargs, call_kwargs = _split_kwargs(raw)
+    # Wire env (ADC vs local SA) + initialize vertex client (use creds if present).
+    # Both are process-global: only redo them when the target (incl. credentials) changes.
+    global _initialized_for
+    target = (cfg.project, cfg.location, cfg.use_adc, cfg.credential_path(), creds)
+    if _initialized_for != target:
+        cfg.apply_google_env()
+        cfg.init_vertex(credentials=creds)
+        _initialized_for = target
 
-    # Construct adapter
+    # Construct adapter (imported here: langchain_google_vertexai pulls in aiplatform/grpc,
+    # which importers of this module shouldn't pay for until a model is actually built)
+    from langchain_google_vertexai import ChatVertexAI
     llm = ChatVertexAI(credentials=creds, **ctor_kwargs)
 
     # Bind runtime-only kwargs (e.g., request_timeout)
     if call_kwargs:
         llm = llm.bind(**call_kwargs)
 
+    if key is not None:
+        _LLM_CACHE[key] = llm
+        if len(_LLM_CACHE) > _LLM_CACHE_SIZE:
+            _LLM_CACHE.popitem(last=False)
     return llm
@@ -9,13 +9,15 @@ import os
 import sys
 import traceback
 import argparse
+from typing import TYPE_CHECKING
 
-import vertexai
 from google.auth.exceptions import DefaultCredentialsError
-from langchain_google_vertexai import ChatVertexAI
 
 from .config.config import Config
 
+if TYPE_CHECKING:
+    from langchain_google_vertexai import ChatVertexAI
+
 
 def print_env_probe(cfg: Config) -> None:
     """Print useful environment & library diagnostics."""
@@ -37,18 +39,22 @@ def print_env_probe(cfg: Config) -> None:
 
 def build_llm(cfg: Config) -> ChatVertexAI:
     """Build ChatVertexAI without triggering a request."""
+    from langchain_google_vertexai import ChatVertexAI
     cfg.apply_google_env()
     cfg.init_vertex()
     credentials = cfg.load_credentials() if not cfg.use_adc else None
     return ChatVertexAI(credentials=credentials, **cfg.llm_kwargs())
 
 
+# Built once; main() may be called repeatedly (tests / harnesses) and parse_args is reusable
+_PARSER = argparse.ArgumentParser(
+    description="Probe Vertex AI environment; optional --call to test an actual LLM request."
+)
+_PARSER.add_argument("--call", action="store_true", help="Actually call the LLM for a test message.")
+
+
 def main(argv=None) -> int:
-    parser = argparse.ArgumentParser(
-        description="Probe Vertex AI environment; optional --call to test an actual LLM request."
-    )
-    parser.add_argument("--call", action="store_true", help="Actually call the LLM for a test message.")
-    args = parser.parse_args(argv)
+    args = _PARSER.parse_args(argv)
 
     try:
         cfg = Config.load()
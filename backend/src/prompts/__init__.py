@@ -6,18 +6,15 @@ import re
 
 from langchain_core.prompts import BasePromptTemplate
 
-# Public registry (filled by discovery)
+# Public registry (filled lazily by get_prompt / discovery)
 PROMPTS: Dict[str, BasePromptTemplate] = {}
 
-_NAME_CLEAN = re.compile(r"_prompt$", re.IGNORECASE)
-
 def _norm_from_attr(attr_name: str) -> str:
     """
     Convert VAR names like 'LLM_ROUTER_PROMPT' or 'BASE_TEXT_ONLY_PROMPT'
     to registry keys 'llm_router' and 'base_text_only'.
     """
-    name = attr_name.lower()
-    name = _NAME_CLEAN.sub("", name)           # strip trailing _prompt
+    name = attr_name.lower().removesuffix("_prompt")  # strip trailing _prompt
     if name.endswith("_"):
         name = name[:-1]
     return name
@@ -31,7 +28,8 @@ def _register_from_module(mod) -> None:
     """
     Module registration rules:
     1) If module defines __all_prompts__ (dict[name, prompt]), use it exactly.
-    2) Else, auto-pick any BasePromptTemplate attrs; key = normalized attr name.
+    2) Else, auto-pick BasePromptTemplate attrs named '*_PROMPT'; key = normalized attr name.
+       (The cheap name check runs first, so imports/helpers are skipped without an isinstance check.)
     """
     custom = getattr(mod, "__all_prompts__", None)
     if isinstance(custom, dict):
@@ -41,45 +39,81 @@ def _register_from_module(mod) -> None:
         return
 
     for attr, obj in vars(mod).items():
-        if isinstance(obj, BasePromptTemplate):
+        if attr.lower().endswith("_prompt") and isinstance(obj, BasePromptTemplate):
             key = _norm_from_attr(attr)
             _register(key, obj)
 
+# Registry keys that may name a prompt module (on-demand imports are limited to these)
+_PROMPT_NAME = re.compile(r"[a-z0-9_]+")
+
+# Discovery state: submodules already tried (imported or missing) + full-scan flag
+_tried: set[str] = set()
+_discovered = False
+
+def _import_prompt_module(mod_name: str) -> None:
+    """Import `<package>.<mod_name>` once and register its prompts (missing/broken modules are skipped)."""
+    if mod_name in _tried:
+        return
+    _tried.add(mod_name)
+    try:
+        mod = importlib.import_module(f"{__name__}.{mod_name}")
+    except Exception:  # pragma: no cover
+        # Keep registry resilient: skip missing or broken prompt modules
+        # (They can be fixed without blocking the whole system)
+        return
+    _register_from_module(mod)
+
 def _discover() -> None:
     """
     Auto-import all submodules in this package whose name ends with '_prompt'.
     Register any BasePromptTemplate they expose.
     """
+    global _discovered
     pkg = importlib.import_module(__name__)
     for m in pkgutil.iter_modules(pkg.__path__):
         if m.ispkg:
             continue
         if not m.name.endswith("_prompt"):
             continue
-        try:
-            mod = importlib.import_module(f"{__name__}.{m.name}")
-        except Exception as e:  # pragma: no cover
-            # Keep registry resilient: skip broken prompt modules
-            # (They can be fixed without blocking the whole system)
-            continue
-        _register_from_module(mod)
+        _import_prompt_module(m.name)
+    _discovered = True
 
 def reload_prompts() -> Dict[str, str]:
     """Dev helper: clear & re-discover prompts; return summary."""
     PROMPTS.clear()
+    _tried.clear()
     _discover()
     return list_prompts()
 
 def get_prompt(name: str) -> BasePromptTemplate:
+    """
+    Look up a prompt, importing only the module that should define it.
+    'base_text_only' tries base_text_only_prompt, base_text_prompt, then base_prompt;
+    anything else falls back to a single full package scan, after which misses are plain
+    dict lookups.
+    """
+    prompt = PROMPTS.get(name)
+    if prompt is not None:
+        return prompt
+    # After a full scan every prompt is registered: a miss is final, no more imports.
+    # Names come from request bodies, so only well-formed ones drive module imports.
+    if not _discovered:
+        if _PROMPT_NAME.fullmatch(name):
+            parts = name.split("_")
+            for n in range(len(parts), 0, -1):
+                _import_prompt_module("_".join(parts[:n]) + "_prompt")
+                if name in PROMPTS:
+                    return PROMPTS[name]
+        _discover()
     try:
         return PROMPTS[name]
     except KeyError:
         raise KeyError(f"Unknown prompt: {name}. Known: {sorted(PROMPTS.keys())}")
 
 def list_prompts() -> Dict[str, str]:
+    if not _discovered:
+        _discover()
     return {k: type(v).__name__ for k, v in PROMPTS.items()}
 
-# ---- initial discovery at import time ----
-_discover()
-
+# Discovery is lazy: get_prompt imports on demand; list_prompts scans the package.
 __all__ = ["PROMPTS", "get_prompt", "list_prompts", "reload_prompts"]
@@ -0,0 +1,77 @@
+# tests/agents/test_rule_router_agent.py
+from __future__ import annotations
+import pytest
+
+from src.agents import rule_router_agent as rra
+from src.agents.rule_router_agent import RuleRouterAgent
+
+
+def _reference_route(text, must_include, forbid):
+    """The original per-keyword `in` checks the single-pass scan must agree with."""
+    tl = text.lower()
+    missing = [k for k in must_include if k.lower() not in tl]
+    if missing:
+        return "REFINE", [f"missing:{','.join(missing)}"]
+    bad = [k for k in forbid if k.lower() in tl]
+    if bad:
+        return "REFINE", [f"forbidden:{','.join(bad)}"]
+    return "PASS", []
+
+
+@pytest.mark.parametrize("must_include,forbid", [
+    ([], []),                                   # empty keyword lists
+    (["gpu"], []),                              # single keyword (no scanner)
+    ([], ["irb"]),
+    (["random", "randomized"], []),             # prefix keywords (substring fallback)
+    (["gpu"], ["gp"]),
+    (["abc", "bcd"], []),                       # overlapping keywords
+    (["ana", "nan"], ["xyz"]),
+    (["GPU", "Regression"], ["IRB"]),           # mixed case
+    (["gpu", "gpu"], []),                       # duplicates
+])
+@pytest.mark.parametrize("text", [
+    "",
+    "We ran a randomized trial on a GPU.",
+    "abcd banana",
+    "bcd only",
+    "Regression on gpu; IRB approved",
+    "randomize",
+])
+def test_keyword_checks_match_reference(text, must_include, forbid):
+    agent = RuleRouterAgent(must_include=must_include, forbid=forbid)
+    out = agent.invoke({"draft": text})
+    assert (out["route"], out["reasons"]) == _reference_route(text, must_include, forbid)
+
+
+def test_prefix_keywords_skip_the_scanner():
+    assert rra._compile_keyword_scan(("random", "randomized")) is None
+    assert rra._compile_keyword_scan(("gpu",)) is None
+    assert rra._compile_keyword_scan(("abc", "bcd")) is not None
+
+
+def test_regex_defaults_to_stdlib_re():
+    agent = RuleRouterAgent(regex=r"done$")
+    assert agent.regex_engine == "re"
+    assert agent.regex.__class__ is rra.re.compile("x").__class__
+    # stdlib `$` also matches before a trailing newline
+    assert agent.invoke({"draft": "all done\n"})["route"] == "PASS"
+
+
+def test_unknown_or_missing_regex_engine_raises(monkeypatch):
+    with pytest.raises(ValueError):
+        RuleRouterAgent(regex="x", regex_engine="pcre")
+    monkeypatch.setitem(rra._REGEX_ENGINES, "re2", None)
+    with pytest.raises(ValueError):
+        RuleRouterAgent(regex="x", regex_engine="re2")
+
+
+@pytest.mark.parametrize("pattern,text", [
+    (r"^\{.*\}$", '{"a": 1}'),
+    (r"\d{3}-\d{4}", "call 555-1234"),
+    (r"(?i)hello", "HELLO there"),
+    (r"abc", "xyz"),
+])
+def test_re2_and_re_agree_on_portable_patterns(pattern, text):
+    pytest.importorskip("re2")
+    verdict = lambda eng: RuleRouterAgent(regex=pattern, regex_engine=eng).invoke({"draft": text})["route"]
+    assert verdict("re2") == verdict("re")
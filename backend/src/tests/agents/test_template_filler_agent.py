@@ -0,0 +1,56 @@
+# tests/agents/test_template_filler_agent.py
+from __future__ import annotations
+import pytest
+
+from src.agents import template_filler_agent as tfa
+from src.agents.template_filler_agent import TemplateFillerAgent
+
+
+class _Obj:
+    attr = "A"
+
+    def __repr__(self) -> str:
+        return "<Obj>"
+
+    def __str__(self) -> str:
+        return "obj"
+
+
+STATE = {"name": "Ada", "n": 3.14159, "items": ["x", "y"], "obj": _Obj(), "w": 8}
+
+
+def _reference(template, state):
+    """The original `str.format_map` fill with its non-strict fallback."""
+    try:
+        return template.format_map(state)
+    except Exception:
+        return template
+
+
+@pytest.mark.parametrize("template", [
+    "",
+    "plain text",
+    "Hello {name}!",
+    "{{literal}} {name} }}{{",                  # escaped braces
+    "{n:.2f} | {n:>10.3f} | {name:^9}",         # format specs
+    "{obj!r} {obj!s} {name!a}",                 # conversions
+    "{obj.attr} {items[1]}",                    # attribute / index lookups
+    "{n:{w}.2f}",                               # nested spec → format_map path
+    "{missing}",                                # missing key → raw template
+    "{n:d}",                                    # bad spec → raw template
+    "{}",                                       # positional field → raw template
+    "unbalanced {",                             # malformed → raw template
+])
+def test_render_matches_format_map(template):
+    out = TemplateFillerAgent(template).invoke(STATE)
+    assert out == {"text": _reference(template, STATE)}
+
+
+def test_plan_is_skipped_for_malformed_or_nested_specs():
+    assert tfa._compile_template("unbalanced {") is None
+    assert tfa._compile_template("{n:{w}}") is None
+    assert tfa._compile_template("{{x}} {name}") is not None
+
+
+def test_output_key():
+    assert TemplateFillerAgent("{name}", output_key="greeting").invoke(STATE) == {"greeting": "Ada"}
@@ -3,7 +3,9 @@ from __future__ import annotations
 import os
 import pytest
 
-from langchain_core.language_models.fake_chat_models import FakeListChatModel
+# Importable because pytest's default "prepend" import mode puts this conftest's
+# directory (tests/, no __init__.py) on sys.path; breaks under --import-mode=importlib.
+from helpers.fake_llm import make_fake_llm
 
 # ---- Global switch: use real LLM? ----
 @pytest.fixture(scope="session")
@@ -21,8 +23,8 @@ def fake_llm_factory():
     """
     Usage:
         llm = fake_llm_factory(["hello", "world"])
-    This cycles responses in order.
+    This cycles responses in order (FastFakeLLM unless USE_LC_FAKE=1, see make_fake_llm).
     """
     def _make(responses):
-        return FakeListChatModel(responses=responses)
+        return make_fake_llm(responses)
     return _make
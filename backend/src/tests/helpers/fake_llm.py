@@ -1,11 +1,40 @@
 # tests/helpers/fake_llm.py
-from typing import Sequence
+import os
+from typing import Any, Sequence, Union
 from langchain_core.language_models.fake_chat_models import FakeListChatModel
 from langchain_core.messages import AIMessage
 
-def make_fake_llm(responses: Sequence[str]) -> FakeListChatModel:
+class FastFakeLLM:
     """
-    Create a FakeListChatModel that cycles through the given responses.
+    Minimal stand-in for FakeListChatModel: cycles through `responses` and returns
+    AIMessage(content=...), skipping the chat-model machinery (pydantic validation,
+    callback manager, message conversion) on every call.
+
+    Being callable, it composes in LCEL chains (`prompt | llm | parser`): LangChain
+    wraps it in a RunnableLambda.
+    """
+    __slots__ = ("_responses", "_i")
+
+    def __init__(self, responses: Sequence[str]) -> None:
+        self._responses = tuple(responses)
+        self._i = 0
+
+    def __call__(self, _input: Any) -> AIMessage:
+        r = self._responses[self._i % len(self._responses)]
+        self._i += 1
+        return AIMessage(content=r)
+
+    def invoke(self, input: Any, config: Any = None, **kwargs: Any) -> AIMessage:
+        return self(input)
+
+    async def ainvoke(self, input: Any, config: Any = None, **kwargs: Any) -> AIMessage:
+        return self(input)
+
+def make_fake_llm(responses: Sequence[str]) -> Union[FastFakeLLM, FakeListChatModel]:
+    """
+    Create a fake LLM that cycles through the given responses: FastFakeLLM by
+    default, or langchain's FakeListChatModel when USE_LC_FAKE=1 (for tests that
+    need a real chat-model Runnable).
 
     Example:
         responses = ["A", "B"]
@@ -13,7 +42,9 @@ def make_fake_llm(responses: Sequence[str]) -> FakeListChatModel:
         Call #2 -> "B"
         Call #3 -> "A" (wraps around)
     """
-    return FakeListChatModel(responses=list(responses))
+    if os.getenv("USE_LC_FAKE") == "1":
+        return FakeListChatModel(responses=list(responses))
+    return FastFakeLLM(responses)
 
 def get_llm(mode: str, real_llm_factory):
     """
@@ -25,7 +56,7 @@ def get_llm(mode: str, real_llm_factory):
             (e.g., your project's `get_vertex_chat_model`).
 
     Returns:
-        FakeListChatModel if mode == "fake",
+        make_fake_llm(...) result if mode == "fake",
         otherwise the result of real_llm_factory().
     """
     if mode == "fake":
@@ -1,11 +1,10 @@
 # tests/helpers/recorder.py
-from dataclasses import dataclass
-from typing import Any, Dict, List
+from typing import Any, Dict, List, NamedTuple
 
-@dataclass
-class Snap:
+class Snap(NamedTuple):
     """
     Represents a snapshot of state captured at a specific step.
+    A NamedTuple: cheaper to build and smaller than a dataclass instance.
 
     Attributes:
         step: Name or label of the step where the snapshot was taken.
@@ -54,4 +53,5 @@ class StateRecorder:
                     ...<all key-value pairs from the recorded state>...
                 }
         """
-        return [{"step": s.step, **s.state} for s in self.snaps]
+        # dict | dict merges in C with a single allocation (state keys still win)
+        return [{"step": s.step} | s.state for s in self.snaps]
@@ -0,0 +1,53 @@
+# tests/test_logging_config.py
+from __future__ import annotations
+import json
+import logging
+
+import pytest
+
+from src.config import logging_config as lc
+from src.core.context import request_id_context
+
+
+@pytest.fixture
+def record_factory():
+    old = logging.getLogRecordFactory()
+    logging.setLogRecordFactory(lc._record_factory)
+    try:
+        yield
+    finally:
+        logging.setLogRecordFactory(old)
+
+
+def _capture(logger: logging.Logger) -> list:
+    records: list = []
+    handler = logging.Handler()
+    handler.emit = records.append
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    return records
+
+
+def test_request_id_from_context(record_factory):
+    records = _capture(logging.getLogger("test.logging.ctx"))
+    with request_id_context("rid-ctx"):
+        logging.getLogger("test.logging.ctx").info("hello")
+    payload = json.loads(lc.JsonFormatter().format(records[0]))
+    assert payload["request_id"] == "rid-ctx"
+
+
+def test_explicit_request_id_extra_wins(record_factory):
+    records = _capture(logging.getLogger("test.logging.extra"))
+    with request_id_context("rid-ctx"):
+        # Must not raise "Attempt to overwrite 'request_id' in LogRecord"
+        logging.getLogger("test.logging.extra").info("hello", extra={"request_id": "rid-extra"})
+    payload = json.loads(lc.JsonFormatter().format(records[0]))
+    assert payload["request_id"] == "rid-extra"
+
+
+def test_no_request_id_outside_a_request(record_factory):
+    records = _capture(logging.getLogger("test.logging.none"))
+    logging.getLogger("test.logging.none").info("hello")
+    payload = json.loads(lc.JsonFormatter().format(records[0]))
+    assert "request_id" not in payload
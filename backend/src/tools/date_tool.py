@@ -1,9 +1,28 @@
 from __future__ import annotations
-from datetime import date, timedelta
+import time
+from datetime import date, datetime, timedelta
+
+from .registry import registry
+
+# (expires_at, iso): today's ISO date, valid until the next local midnight
+_today_cache: tuple[float, str] = (0.0, "")
 
 def get_today_iso() -> str:
-    return date.today().isoformat()
+    """Today's local date as ISO string; recomputed only once the day rolls over."""
+    global _today_cache
+    now = time.time()
+    expires_at, iso = _today_cache
+    if now < expires_at:
+        return iso
+    today = date.fromtimestamp(now)
+    next_midnight = datetime.combine(today + timedelta(days=1), datetime.min.time()).timestamp()
+    _today_cache = (next_midnight, today.isoformat())
+    return _today_cache[1]
 
 
 def get_yesterday_iso() -> str:
-    return (date.today() - timedelta(days=1)).isoformat()
\ No newline at end of file
+    return (date.today() - timedelta(days=1)).isoformat()
+
+
+# Register once at import so the app (and tests) never re-register per create_app()
+registry.register("date.today", get_today_iso)
@@ -22,8 +22,9 @@ class ToolRegistry:
     """
 
     def __init__(self) -> None:
-        # Internal mapping: tool name → callable
-        self._tools: Dict[str, Callable[..., Any]] = {}
+        # Internal mapping: tool name → (callable, is_coroutine_function).
+        # The async check is done once in register(), not on every acall().
+        self._tools: Dict[str, tuple[Callable[..., Any], bool]] = {}
 
     def register(self, name: str, func: Callable[..., Any]) -> None:
         """
@@ -38,7 +39,7 @@ class ToolRegistry:
         """
         if not callable(func):
             raise TypeError("func must be callable")
-        self._tools[name] = func
+        self._tools[name] = (func, inspect.iscoroutinefunction(func))
 
     def get(self, name: str) -> Callable[..., Any]:
         """
@@ -53,9 +54,13 @@ class ToolRegistry:
         Raises:
             KeyError: If the tool name is not found.
         """
-        if name not in self._tools:
-            raise KeyError(f"Tool not found: {name}")
-        return self._tools[name]
+        return self._entry(name)[0]
+
+    def _entry(self, name: str) -> tuple[Callable[..., Any], bool]:
+        try:
+            return self._tools[name]
+        except KeyError:
+            raise KeyError(f"Tool not found: {name}") from None
 
     def call(self, name: str, **kwargs) -> Any:
         """
@@ -86,8 +91,8 @@ class ToolRegistry:
             - Async functions are awaited directly.
             - Sync functions are executed in a thread to avoid blocking.
         """
-        func = self.get(name)
-        if inspect.iscoroutinefunction(func):
+        func, is_async = self._entry(name)
+        if is_async:
             return await func(**kwargs)
         # Run synchronous function in a thread to keep event loop responsive
         return await asyncio.to_thread(func, **kwargs)
@@ -0,0 +1,12 @@
+from __future__ import annotations
+
+from .registry import registry
+
+
+def mark_double(s: str) -> str:
+    """Demo tool used by the test_graph DOUBLE branch."""
+    return f"double::{s}"
+
+
+# Registered once at import (see tools/date_tool.py)
+registry.register("string.mark_double", mark_double)
@@ -14,8 +14,11 @@ This program serves as an example of how AMIE can utilize tools in an MVP
 """
 
 from fastapi import FastAPI, UploadFile, File, Query, HTTPException, BackgroundTasks
+from fastapi.concurrency import run_in_threadpool
+from functools import lru_cache
 from uuid import uuid4, UUID
-import json
+import orjson
+from cachetools import TTLCache
 from google.cloud import storage
 from google import genai
 from google.genai import types
@@ -26,11 +29,17 @@ Locally, connects through Application Default Credentials (ADC) through gcloud C
 
 When running in Google Cloud, credentials are automatically pulled from the metadata server, from service account attached
 """
-storage_client = storage.Client()
-genai_client = genai.Client(vertexai=True, project="aime-hello-world", location="us-west1")
+BUCKET_NAME = "aime-manuscripts"
+
+# Clients are built on first use (not at import), then shared by every request in the worker
+@lru_cache(maxsize=1)
+def get_genai() -> genai.Client:
+    return genai.Client(vertexai=True, project="aime-hello-world", location="us-west1")
 
 # Connect to manuscripts bucket
-bucket = storage_client.bucket("aime-manuscripts")
+@lru_cache(maxsize=1)
+def get_bucket() -> storage.Bucket:
+    return storage.Client().bucket(BUCKET_NAME)
 
 
 app = FastAPI()
@@ -49,8 +58,9 @@ class Manuscript():
         self.response: str = ""
 
 
-# Store requests as id:manuscript
-files: dict[UUID, Manuscript] = {}
+# Store requests as id:manuscript. Bounded + expiring so finished requests don't pile up
+# forever; only touched from async routes (event loop thread), so no lock is needed.
+files: "TTLCache[UUID, Manuscript]" = TTLCache(maxsize=10_000, ttl=3600)
 
 
 @app.get("/")
@@ -85,8 +95,15 @@ async def new_file(background_tasks: BackgroundTasks, file: UploadFile = File(..
     Gemini analysis. Returns a request ID that clients can use with /status.
     """
     
+    # Only PDFs are analyzed: reject others before any upload or background work.
+    # The content type is client-supplied, so also check the %PDF magic bytes.
+    head = await file.read(4)
+    await file.seek(0)
+    if file.content_type != "application/pdf" or head != b"%PDF":
+        raise HTTPException(415, detail="PDF required")
+
     # Create record now so clients can query /status immediately.
-    m = Manuscript(file.filename, file.content_type, bucket.name)
+    m = Manuscript(file.filename, file.content_type, BUCKET_NAME)
     files[m.request_id] = m
 
     # Upload file to Google Cloud Bucket.
@@ -100,14 +117,16 @@ async def new_file(background_tasks: BackgroundTasks, file: UploadFile = File(..
 
 async def upload_to_cloud(file: UploadFile, m: Manuscript):
 
-    new_blob = bucket.blob(m.objectname)
+    new_blob = get_bucket().blob(m.objectname)
 
     file.file.seek(0)
-    # Stream from FastAPI file object to GCS Bucket
-    new_blob.upload_from_file(
+    # Stream from FastAPI file object to GCS Bucket. The GCS client is blocking, so run it
+    # in the threadpool: other requests (e.g. /status polls) keep being served meanwhile.
+    await run_in_threadpool(
+        new_blob.upload_from_file,
         file.file,
         rewind=True,
-        content_type=file.content_type
+        content_type=file.content_type,
     )
 
     await file.close()
@@ -118,14 +137,9 @@ def prompt_vertex(m: Manuscript):
 
     m.status = "WORKING"
 
-    if not m.type == "application/pdf":
-        m.status = "FAILED"
-        m.finished = True
-        return
-    
     try:
 
-        resp = genai_client.models.generate_content(
+        resp = get_genai().models.generate_content(
             model="gemini-2.0-flash-lite-001",
             contents=[
                 types.Part.from_uri(file_uri=m.gcs_uri, mime_type="application/pdf"),
@@ -148,7 +162,7 @@ def prompt_vertex(m: Manuscript):
         )
 
         text = resp.text
-        m.response = json.loads(text)
+        m.response = orjson.loads(text)  # model JSON can be large; orjson parses it faster
         m.status = "SUCCESS"
         m.finished = True
         print("finished LLM")
@@ -1,11 +1,21 @@
+import asyncio
+import atexit
+import hashlib
 import json
+import os
 import requests
+import shutil
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
 from typing import List, Optional
 
 from google import genai
-from google.genai import types
-from google.cloud import bigquery, storage
+from google.genai import errors, types
+from google.cloud import storage
 from serpapi import GoogleSearch
 
 
@@ -14,24 +24,129 @@ class Patent:
     pub_num: str
     title: str
     snippet: str
-    pdf_link: str
+    pdf_link: str | None
     gs_link: str | None = None
     report: str | None = None
 
 gpc_project_name = "aime-hello-world"
 gs_bucket_name = "aime-manuscripts"
-s_client = storage.Client()
-bucket = s_client.bucket(gs_bucket_name)
-bq_client = bigquery.Client(project=gpc_project_name)
-genai_client = genai.Client(project=gpc_project_name, location="us-west1", vertexai=True)
+
+# Lazy client singletons: each authenticates on first use only
+@lru_cache(maxsize=1)
+def get_storage() -> storage.Client:
+    return storage.Client()
+
+@lru_cache(maxsize=1)
+def get_bucket() -> storage.Bucket:
+    return get_storage().bucket(gs_bucket_name)
+
+@lru_cache(maxsize=1)
+def get_genai() -> genai.Client:
+    return genai.Client(project=gpc_project_name, location="us-west1", vertexai=True)
+
+# One keep-alive pool for the PDF downloads (sized above upload_to_gcs's worker count)
+http = requests.Session()
+http.mount("https://", requests.adapters.HTTPAdapter(pool_connections=32, pool_maxsize=32))
 
 model = "gemini-2.0-flash-lite-001"
+# Model per stage: the cheap tier covers keyword extraction and the O(N) per-match comparisons
+# (both must match the context cache's model); the one final rubric call, which reads every
+# report at once, gets the Pro tier
+MODELS = {"extract": model, "compare": model, "synthesize": "gemini-2.5-pro"}
 src: str = "gs://aime-manuscripts/patent.pdf"
 date: str | None = "2025-09-10"
 
 
+def cache_pdf(uri: str, ttl: str = "3600s") -> str | None:
+    """
+    Tokenize a PDF once as Gemini cached content; calls then pass `cached_content=<name>`
+    instead of re-sending the file. Returns None (callers send the PDF inline) when
+    caching is unavailable, e.g. the document is below the model's minimum cache size.
+    """
+    try:
+        cache = get_genai().caches.create(
+            model=model,
+            config=types.CreateCachedContentConfig(
+                contents=[types.Content(role="user", parts=[types.Part.from_uri(file_uri=uri, mime_type="application/pdf")])],
+                ttl=ttl,
+            ),
+        )
+    except Exception as e:
+        print(f"Context cache unavailable, sending {uri} inline: {e}")
+        return None
+    return cache.name
+
+# The manuscript is part of every synonym/comparison call: cache it once up front
+src_cache: str | None = cache_pdf(src)
+
+def _delete_src_cache() -> None:
+    try:
+        get_genai().caches.delete(name=src_cache)
+    except Exception as e:
+        print(f"Could not delete context cache {src_cache}: {e}")
+
+# The cache is billed until deleted: drop it however the script ends (quit(), errors, normal exit)
+if src_cache:
+    atexit.register(_delete_src_cache)
+
+def manuscript_content(prompt: str, uris: list[str] | None = None) -> list:
+    """Content for a call about the manuscript (+ extra PDFs): the manuscript goes inline only if uncached."""
+    return multimedia_content(prompt, ([] if src_cache else [src]) + (uris or []))
+
+
+# Parsed JSON answers from call_LLM, one file per request hash: re-running the script on the
+# same manuscript skips the Gemini round-trips (delete the directory to force fresh calls).
+llm_cache_dir = Path(__file__).with_name(".llm_cache")
+llm_cache_ttl = 24 * 3600  # seconds
+
+@lru_cache(maxsize=None)
+def _gcs_version(uri: str) -> str:
+    """generation:md5 of a gs:// object, so a re-upload to the same path changes cache keys."""
+    bucket_name, _, name = uri.removeprefix("gs://").partition("/")
+    blob = get_storage().bucket(bucket_name).get_blob(name)
+    return f"{blob.generation}:{blob.md5_hash}" if blob else ""
+
+def _request_key(model_name: str, content, conf) -> str:
+    def dump(x) -> str:
+        return x.model_dump_json() if hasattr(x, "model_dump_json") else json.dumps(x, sort_keys=True, default=str)
+
+    # Cached-content names change per run: key on the manuscript they stand for instead
+    if src_cache and getattr(conf, "cached_content", None) == src_cache:
+        conf = conf.model_copy(update={"cached_content": src})
+
+    # Every call_LLM request is about the manuscript: key on its content, not just its path
+    h = hashlib.sha256(model_name.encode())
+    h.update(_gcs_version(src).encode())
+    for part in (content if isinstance(content, list) else [content]):
+        h.update(dump(part).encode())
+    h.update(dump(conf).encode())
+    return h.hexdigest()
+
+
+def _write_cache(cache_file: Path, output: dict) -> None:
+    """Write via temp file + os.replace so readers never see a half-written entry."""
+    try:
+        llm_cache_dir.mkdir(exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=llm_cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(output, f)
+        os.replace(tmp, cache_file)
+    except OSError as e:
+        print(f"Could not write LLM cache {cache_file}: {e}")
+
+
 def call_LLM(genai_client: genai.Client, model_name: str, content: types.ContentListUnionDict, conf: types.GenerateContentConfigOrDict | None = None, repeats = 5) -> dict | None:
-    
+
+    # The cache is best-effort: if the key can't be computed (e.g. GCS lookup fails) or the
+    # entry is unreadable, just call the model
+    try:
+        cache_file: Path | None = llm_cache_dir / f"{_request_key(model_name, content, conf)}.json"
+        if cache_file.exists() and time.time() - cache_file.stat().st_mtime < llm_cache_ttl:
+            return json.loads(cache_file.read_text(encoding="utf-8"))
+    except Exception as e:
+        print(f"LLM cache unavailable: {e}")
+        cache_file = None
+
     for i in range(repeats):
 
         output = None
@@ -44,6 +159,16 @@ def call_LLM(genai_client: genai.Client, model_name: str, content: types.Content
                 config=conf
             )
             output = json.loads(resp.text)
+
+        except errors.ClientError as e:
+
+            # 4xx (bad request, auth, permissions) fails the same way every time; only
+            # rate limiting (429) is worth another attempt
+            if e.code != 429:
+                print(f"LLM error (not retried): {e}")
+                return None
+            print(f"LLM error: {e}")
+            output = None
         
         except Exception as e:
 
@@ -51,7 +176,13 @@ def call_LLM(genai_client: genai.Client, model_name: str, content: types.Content
             output = None
 
         if output is not None:
+            if cache_file is not None:
+                _write_cache(cache_file, output)
             break
+
+        # Exponential backoff so retries don't hammer an overloaded/rate-limited endpoint
+        if i < repeats - 1:
+            time.sleep(0.5 * 2 ** i)
     
     return output
     
@@ -61,8 +192,8 @@ def multimedia_content(prompt: str,uris: str | list[str], m_type: str = "applica
     parts.append(prompt)
     return parts
 
-def response_schema(schema = dict, response_type: str = "application/json") -> types.GenerateContentConfig:
-    return types.GenerateContentConfig(response_schema=schema, response_mime_type=response_type)
+def response_schema(schema = dict, response_type: str = "application/json", cached_content: str | None = None) -> types.GenerateContentConfig:
+    return types.GenerateContentConfig(response_schema=schema, response_mime_type=response_type, cached_content=cached_content)
 
 def generate_prompt(prompt: str, params: str, matches: int, max: int = 200, min: int = 10):
     if params == "":
@@ -76,11 +207,65 @@ def generate_prompt(prompt: str, params: str, matches: int, max: int = 200, min:
     """
 
 def build_prompt(l: list):
-    quoted_groups = [[f'"{w}"' for w in group] for group in l]
+    # Google Patents matching is case-insensitive: drop blank and repeated terms within each
+    # OR group so the query carries no redundant clauses (groups themselves stay intact)
+    groups = ({w.strip().lower(): w.strip() for w in group if w.strip()}.values() for group in l)
 
-    return " AND ".join(f"({' OR '.join(group)})" for group in quoted_groups)
+    return " AND ".join("(" + " OR ".join(f'"{w}"' for w in group) + ")" for group in groups if group)
 
 
+def search_page(query: str, page: int) -> dict:
+    params = {
+        "engine": "google_patents",
+        "q": query,
+        "api_key": "c1399ae2d3bedfc7239371b16e0cb5650465fbc58220f7843606525644f7b468",
+        "page": page
+    }
+    search = GoogleSearch(params)
+    return search.get_dict()
+
+def search_pages(query: str, max_pages: int):
+    """
+    Yield SerpAPI results page by page. Page 1 alone decides whether the query is
+    reprompted, so it is fetched first; if the caller keeps iterating, pages 2..max_pages
+    are fetched concurrently (a few at a time) and yielded in order.
+    """
+    yield search_page(query, 1)
+    if max_pages > 1:
+        pool = ThreadPoolExecutor(max_workers=min(4, max_pages - 1))
+        try:
+            yield from pool.map(lambda page: search_page(query, page), range(2, max_pages + 1))
+        finally:
+            # Caller stopped early (no results / reprompt): drop queued pages instead of paying for them
+            pool.shutdown(wait=False, cancel_futures=True)
+
+# Keyword-generation prompt and its output schema: constant across retries
+SYNONYM_PROMPT = """
+Generate groups of synonyms to use for patent prior-art searching.
+Each group should contain 3 closely related terms that could be used interchangeably.
+Groups should collectively capture:
+- What is built (the invention itself)
+- How it works or what processes it performs
+- Key technical details or domain-specific terms that a patent examiner would care about
+
+Return the result as a nested JSON array in which each inner array is a group of synonyms.
+"""
+
+SYNONYM_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "synonym_groups": {
+            "type": "array",
+            "items": {
+                "type": "array",
+                "items": {"type": "string"},
+                "maxItems": 3
+            }
+        }
+    },
+    "required": ["synonym_groups"]
+}
+
 def fetch_matches(max_pages = 1, max_tries = 5):
     tries = 0
     old_output = ""
@@ -90,36 +275,9 @@ def fetch_matches(max_pages = 1, max_tries = 5):
 
         reprompt = False
 
-        synonym_prompt = f"""
-        Generate groups of synonyms to use for patent prior-art searching.
-        Each group should contain 3 closely related terms that could be used interchangeably.
-        Groups should collectively capture:
-        - What is built (the invention itself)
-        - How it works or what processes it performs
-        - Key technical details or domain-specific terms that a patent examiner would care about
-
-        Return the result as a nested JSON array in which each inner array is a group of synonyms.
-        """
-
-        prompt = generate_prompt(synonym_prompt, old_output, matches)
-
-        synonym_schema = {
-            "type": "object",
-            "properties": {
-                "synonym_groups": {
-                    "type": "array",
-                    "items": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "maxItems": 3
-                    }
-                }
-            },
-            "required": ["synonym_groups"]
-        }
-
+        prompt = generate_prompt(SYNONYM_PROMPT, old_output, matches)
 
-        sy = call_LLM(genai_client, model_name=model, content=multimedia_content(prompt, src), conf=response_schema(synonym_schema))
+        sy = call_LLM(get_genai(), model_name=MODELS["extract"], content=manuscript_content(prompt), conf=response_schema(SYNONYM_SCHEMA, cached_content=src_cache))
         if sy is None:
             print("keyword LLM call failed.")
             quit()
@@ -128,15 +286,7 @@ def fetch_matches(max_pages = 1, max_tries = 5):
 
         pubs: list[Patent] = []
 
-        for page in range(1, max_pages + 1):
-            params = {
-                "engine": "google_patents",
-                "q": query,
-                "api_key": "c1399ae2d3bedfc7239371b16e0cb5650465fbc58220f7843606525644f7b468",
-                "page": page
-            }
-            search = GoogleSearch(params)
-            results = search.get_dict()
+        for page, results in enumerate(search_pages(query, max_pages), start=1):
 
             if 10 > (matches := results.get("search_information", {}).get("total_results", -1)) or matches > 200:
 
@@ -156,7 +306,7 @@ def fetch_matches(max_pages = 1, max_tries = 5):
                         pub.get("publication_number", "no publication number available"),
                         pub.get("title", "no title available"),
                         pub.get("snippet", "no snippet available"),
-                        pub.get("pdf", "no pdf available")
+                        pub.get("pdf")
                     )
                 )
         if not reprompt:
@@ -174,50 +324,78 @@ pubs = fetch_matches()
 if pubs is None:
     quit()
 
-def upload_to_gcs(pubs: list[Patent] | None):
+pdf_chunk_size = 8 * 1024 * 1024  # resumable-upload chunk; must be a multiple of 256 KiB
 
-    if pubs is None:
+def copy_pdf_to_gcs(pub: Patent) -> None:
+    """Download one match's PDF and store it in the bucket; sets pub.gs_link on success."""
+    # No link (or not a URL): skip instead of issuing a request that can only time out
+    if not isinstance((pdf := pub.pdf_link), str) or not pdf.startswith("http"):
+        return
+    blob = None
+    try:
+        # Copy socket -> GCS through a resumable writer: only one chunk is buffered at a time,
+        # and each chunk is held until acknowledged, so a failed chunk can be retried
+        with http.get(pdf, timeout=60, stream=True) as resp:
+            resp.raise_for_status()  # before the writer exists: a bad response never touches GCS
+            resp.raw.decode_content = True
+            blob = get_bucket().blob(pub_path := (f"matches/{pub.pub_num}.pdf"))
+            with blob.open("wb", chunk_size=pdf_chunk_size, content_type="application/pdf") as out:
+                shutil.copyfileobj(resp.raw, out, length=1024 * 1024)
+        pub.gs_link = f"gs://{gs_bucket_name}/{pub_path}"
+    except Exception as e:
+        print(f"Could not copy {pdf} to GCS: {e}")
+        # Closing the writer (even on error) finalizes the upload: drop the truncated object
+        if blob is not None:
+            try:
+                blob.delete()
+            except Exception:
+                pass
         return
 
-    for pub in pubs:
-        if not isinstance((pdf := pub.pdf_link), str):
-            continue
-        try:
-            resp = requests.get(pdf, timeout=60)
-            resp.raise_for_status()
-            pdf_bytes = resp.content
+def upload_to_gcs(pubs: list[Patent] | None, max_workers: int = 8):
 
-            blob = bucket.blob(pub_path := (f"matches/{pub.pub_num}.pdf"))
-            blob.upload_from_string(pdf_bytes, content_type="application/pdf")
-            pub.gs_link = f"gs://{gs_bucket_name}/{pub_path}"
-        except:
-            continue
+    if pubs is None:
+        return
+
+    # Each copy is pure network I/O (download, then GCS upload): overlap them in threads
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        list(pool.map(copy_pdf_to_gcs, pubs))
 
 upload_to_gcs(pubs)
 
 matches = [pub for pub in pubs if pub.gs_link]
 
-for match in matches:
-    resp = genai_client.models.generate_content(
-                model=model,
-                contents=multimedia_content("For all inventions claimed in the first patent, create a description of similarity in the second patent, detailing the method/process, as to evaulate the similarity between the two novel features and determine patentability", [src, match.gs_link])
+async def similarity_reports(matches: list[Patent], max_concurrency: int = 8) -> None:
+    """Fill match.report for every match; the per-match Gemini calls run concurrently (bounded)."""
+    sem = asyncio.Semaphore(max_concurrency)
+
+    async def report(match: Patent) -> None:
+        async with sem:
+            resp = await get_genai().aio.models.generate_content(
+                model=MODELS["compare"],
+                contents=manuscript_content("For all inventions claimed in the first patent, create a description of similarity in the second patent, detailing the method/process, as to evaulate the similarity between the two novel features and determine patentability", [match.gs_link]),
+                config=types.GenerateContentConfig(cached_content=src_cache),
             )
-    match.report = resp.text
+        match.report = resp.text
 
-summaries = "For the manuscript attached, we are determining patentability by evaluating its novelty statements and comparing them to similar matches. First of all, generate a rubric to evaluate novelty, based on the manuscript attached. The following text is the similarity report for each match. After evaluating every one, generate a similarity score percentage with reasoning, assuring that you evaluate every paper on the same scale. At the end, return the scale by which you evaluated, then the scores for each match."
+    await asyncio.gather(*(report(match) for match in matches))
 
-for match in matches:
+asyncio.run(similarity_reports(matches))
 
-    summaries += f"""
+summaries = "For the manuscript attached, we are determining patentability by evaluating its novelty statements and comparing them to similar matches. First of all, generate a rubric to evaluate novelty, based on the manuscript attached. The following text is the similarity report for each match. After evaluating every one, generate a similarity score percentage with reasoning, assuring that you evaluate every paper on the same scale. At the end, return the scale by which you evaluated, then the scores for each match."
+
+# One join instead of repeated += (each of which copies the whole accumulated text)
+summaries += "".join(f"""
 
     for {match.title}:
     
     {match.report}
 
-"""
-    
-resp = genai_client.models.generate_content(
-    model=model,
+""" for match in matches)
+
+resp = get_genai().models.generate_content(
+    model=MODELS["synthesize"],
     contents=summaries
     )
-match.report = resp.text
\ No newline at end of file
+final_report = resp.text
+print(final_report)